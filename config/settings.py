@@ -39,19 +39,202 @@ ARTIFACTS_PLOTS_DIR = ARTIFACTS_DIR / "plots"
 # ARQUIVOS DE MÉTRICAS DO DATASET
 DATASET_METRICS_FILENAME = "dataset_metrics.csv"
 DATASET_METRICS_PATH = ARTIFACTS_METRICS_DIR / DATASET_METRICS_FILENAME
+
+# AMOSTRA DE BOXES (w, h) E ANCHORS ESTIMADOS
+BOX_SAMPLE_FILENAME = "box_sample.npy"
+BOX_SAMPLE_PATH = ARTIFACTS_METRICS_DIR / BOX_SAMPLE_FILENAME
+
+# HISTOGRAMAS PRÉ-AGREGADOS DAS BOXES (entrada dos plots de distribuição)
+BOX_HISTOGRAMS_FILENAME = "box_histograms.npz"
+BOX_HISTOGRAMS_PATH = ARTIFACTS_METRICS_DIR / BOX_HISTOGRAMS_FILENAME
+
+# COOCORRÊNCIA DE CLASSES POR SPLIT (formato longo)
+CLASS_COOCCURRENCE_FILENAME = "class_cooccurrence.csv"
+CLASS_COOCCURRENCE_PATH = ARTIFACTS_METRICS_DIR / CLASS_COOCCURRENCE_FILENAME
+
+ANCHORS_FILENAME = "anchors.csv"
+ANCHORS_PATH = ARTIFACTS_METRICS_DIR / ANCHORS_FILENAME
+
+# RELATÓRIO DE VALIDAÇÃO (um problema por linha)
+VALIDATION_REPORT_FILENAME = "validation_report.csv"
+VALIDATION_REPORT_PATH = ARTIFACTS_METRICS_DIR / VALIDATION_REPORT_FILENAME
+
+# ESTATÍSTICAS DE PIXELS DAS IMAGENS (CSV resumido e sketches por split)
+IMAGE_STATS_FILENAME = "image_stats.csv"
+IMAGE_STATS_PATH = ARTIFACTS_METRICS_DIR / IMAGE_STATS_FILENAME
+
+IMAGE_STATS_SKETCH_FILENAME = "image_stats_sketch.npz"
+IMAGE_STATS_SKETCH_PATH = ARTIFACTS_METRICS_DIR / IMAGE_STATS_SKETCH_FILENAME
+
+# ÍNDICE SQLITE (arquivos, boxes e problemas de validação)
+ARTIFACTS_INDEX_DIR = ARTIFACTS_DIR / "index"
+
+SQLITE_INDEX_FILENAME = "dataset_index.sqlite"
+SQLITE_INDEX_PATH = ARTIFACTS_INDEX_DIR / SQLITE_INDEX_FILENAME
+
+# ESTADOS (SNAPSHOTS) DO DATASET E RELATÓRIOS DE DIFF
+ARTIFACTS_STATES_DIR = ARTIFACTS_DIR / "states"
+ARTIFACTS_DIFF_DIR = ARTIFACTS_DIR / "diff"
+
+DATASET_DIFF_FILENAME = "dataset_diff.csv"
+DATASET_DIFF_FILES_FILENAME = "dataset_diff_files.csv"
+
+# EXECUÇÃO EM LOTE (MÚLTIPLOS DATASETS)
+ARTIFACTS_BATCH_DIR = ARTIFACTS_DIR / "batch"
+
+BATCH_SUMMARY_FILENAME = "batch_summary.csv"
+VALIDATION_SUMMARY_FILENAME = "validation_summary.csv"
+
+# Número de processos do pool compartilhado (None = os.cpu_count())
+BATCH_MAX_WORKERS = None
+
+# CHECKPOINTS DO PIPELINE (retomada de execuções interrompidas)
+ARTIFACTS_CHECKPOINTS_DIR = ARTIFACTS_DIR / "checkpoints"
+
+# CACHE DE ETAPAS DO PIPELINE (manifesto com o hash das entradas de cada etapa)
+ARTIFACTS_CACHE_DIR = ARTIFACTS_DIR / "cache"
+STAGE_MANIFEST_PATH = ARTIFACTS_CACHE_DIR / "stage_manifest.json"
+
+# Cache por arquivo das estatísticas de pixels (um JSON por split)
+IMAGE_STATS_CACHE_DIR = ARTIFACTS_CACHE_DIR / "image_stats"
+
 # LOGS
 LOGS_DIR = ROOT_DIR / "logs"
 
+# EVENTOS DE PROGRESSO (JSON lines, um evento por linha; None = desativado)
+PROGRESS_EVENTS_PATH = LOGS_DIR / "progress_events.jsonl"
+
 
 # PARÂMETROS ANALÍTICOS DO EDA
 
 # Número de bins para histogramas
 HISTOGRAM_BINS = 50
 
+# Faixas (min, max) dos histogramas das features das boxes, usadas no scan de
+# métricas (plots) e no cálculo de drift (KS/PSI) entre versões do dataset.
+# Valores fora da faixa são acumulados nos bins das extremidades.
+BOX_HISTOGRAM_RANGES = {
+    "width": (0.0, 1.0),
+    "height": (0.0, 1.0),
+    "area": (0.0, 1.0),
+    "proportion": (0.0, 10.0),
+}
+
+# Bins por eixo da grade 2D de densidade (w x h), sobre [0, 1] x [0, 1]
+BOX_DENSITY_GRID = 64
+
+# Maior número de boxes por imagem com bin próprio (acima disso, último bin)
+BOXES_PER_IMAGE_MAX = 50
+
+# Máximo de classes distintas na matriz de coocorrência (ids além do limite
+# são ignorados com aviso; protege contra ids corrompidos nos labels)
+COOCCURRENCE_MAX_CLASSES = 1000
+
 # Percentis usados para análise de outliers
 OUTLIER_PERCENTILES = (1, 99)
 
 # Flag para ativar/desativar geração de plots
 ENABLE_PLOTS = True
 
+# Flag para ativar/desativar a geração do índice SQLite
+ENABLE_SQLITE_INDEX = False
+
+# Linhas por executemany/transação na carga do índice SQLite
+SQLITE_BATCH_SIZE = 50_000
+
+# Suavização aplicada aos bins vazios no cálculo do PSI
+PSI_EPSILON = 1e-6
+
+
+# ANCHOR BOXES (k-means com distância 1 - IoU)
+
+# Número de anchors estimados
+ANCHOR_CLUSTERS = 9
+
+# Tamanho máximo da amostra determinística de (w, h) mantida durante o scan
+ANCHOR_SAMPLE_SIZE = 100_000
+
+# Tamanho do mini-batch e número de iterações do k-means
+ANCHOR_BATCH_SIZE = 4096
+ANCHOR_ITERATIONS = 300
+
+# Semente do gerador aleatório (inicialização e mini-batches)
+ANCHOR_SEED = 0
+
+
+# ESTATÍSTICAS DE PIXELS (brilho, contraste, saturação e nitidez)
+
+# Flag para ativar/desativar a etapa de estatísticas de pixels.
+# Desativada por padrão: decodifica todas as imagens do dataset.
+ENABLE_IMAGE_STATS = False
+
+# Maior lado (px) da versão reduzida decodificada de cada imagem.
+# JPEGs são decodificados já reduzidos (draft); a nitidez depende desta resolução.
+IMAGE_STATS_MAX_SIDE = 256
+
+# Número de processos do pool de decodificação (None = os.cpu_count())
+IMAGE_STATS_MAX_WORKERS = None
+
+# Faixas (min, max) dos sketches (histogramas de largura fixa) por estatística.
+# Valores fora da faixa são acumulados nos bins das extremidades.
+IMAGE_STATS_RANGES = {
+    "brightness": (0.0, 255.0),
+    "contrast": (0.0, 128.0),
+    "saturation": (0.0, 255.0),
+    "blur_score": (0.0, 5.0),
+}
+
+# Número de bins de cada sketch
+IMAGE_STATS_SKETCH_BINS = 256
+
+# Quantis estimados a partir dos sketches
+IMAGE_STATS_QUANTILES = (0.05, 0.5, 0.95)
+
+
+# LIMITE DE MEMÓRIA
+
+# Memória máxima (MB) para estruturas acumuladas durante validação e métricas.
+# Acima do limite, os dados parciais são descarregados em arquivos temporários.
+MEMORY_BUDGET_MB = 256
+
+# Fração do MEMORY_BUDGET_MB de cada etapa que lista/lê o dataset.
+# Essas etapas podem executar em paralelo no DAG, por isso as frações somam 1.
+MEMORY_BUDGET_SHARES = {
+    "validation": 0.4,
+    "metrics": 0.3,
+    "image_stats": 0.15,
+    "sqlite_index": 0.15,
+}
+
+# Número de arquivos de label processados por chunk
+CHUNK_SIZE_FILES = 5000
+
+# Diretório dos arquivos temporários (None = diretório temporário do sistema)
+SPILL_DIR = None
+
+
+# PIPELINE (DAG DE ETAPAS)
+
+# Versão do cache de etapas: incrementar invalida os resultados em cache
+# (ex.: após mudanças no cálculo das métricas)
+PIPELINE_CACHE_VERSION = 3
+
+# Número de processos para as etapas que leem o dataset (None = os.cpu_count()).
+# As demais etapas executam na thread principal.
+PIPELINE_MAX_WORKERS = None
+
+
+# CHECKPOINTS
+
+# Intervalo mínimo (segundos) entre gravações de checkpoint.
+# Checkpoints são gravados apenas ao final de um chunk de CHUNK_SIZE_FILES arquivos.
+CHECKPOINT_INTERVAL_S = 60
+
+
+# PROGRESSO DE VARREDURAS LONGAS (validação e métricas)
+
+# Flag para ativar/desativar os relatórios periódicos de progresso
+ENABLE_PROGRESS = True
 
+# Intervalo (segundos) entre relatórios de progresso
+PROGRESS_INTERVAL_S = 10
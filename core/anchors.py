@@ -0,0 +1,203 @@
+"""
+anchors.py
+
+Responsável por estimar anchor boxes (YOLO) a partir da
+amostra de (w, h) gerada no scan de métricas.
+
+Este módulo:
+- executa k-means com distância 1 - IoU (boxes alinhadas pelo centro)
+- usa atualizações em mini-batch vetorizadas (NumPy), com memória
+  limitada ao tamanho da amostra e do mini-batch
+- calcula o fitness como a média do melhor IoU de cada box com os anchors
+
+Não relê os labels do dataset.
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from config.settings import (
+    ANCHOR_BATCH_SIZE,
+    ANCHOR_CLUSTERS,
+    ANCHOR_ITERATIONS,
+    ANCHOR_SEED,
+    BOX_SAMPLE_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+
+# FUNÇÕES AUXILIARES
+def wh_iou(boxes: np.ndarray, anchors: np.ndarray) -> np.ndarray:
+    """
+    IoU entre boxes (n, 2) e anchors (k, 2) alinhados pelo centro.
+
+    Retorna matriz (n, k).
+    """
+
+    inter = (
+        np.minimum(boxes[:, None, 0], anchors[None, :, 0])
+        * np.minimum(boxes[:, None, 1], anchors[None, :, 1])
+    )
+    union = (
+        (boxes[:, 0] * boxes[:, 1])[:, None]
+        + (anchors[:, 0] * anchors[:, 1])[None, :]
+        - inter
+    )
+
+    return inter / np.maximum(union, 1e-12)
+
+
+def _init_centers(boxes: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Inicialização k-means++ com distância 1 - IoU,
+    sobre um subconjunto do tamanho de um mini-batch.
+    """
+
+    pool = boxes[rng.choice(len(boxes), size=min(len(boxes), ANCHOR_BATCH_SIZE), replace=False)]
+    centers = [pool[rng.integers(len(pool))]]
+    min_dist = 1.0 - wh_iou(pool, np.asarray(centers))[:, 0]
+
+    for _ in range(1, k):
+        total = min_dist.sum()
+
+        if total <= 0:
+            index = rng.integers(len(pool))
+        else:
+            index = rng.choice(len(pool), p=min_dist / total)
+
+        centers.append(pool[index])
+        min_dist = np.minimum(min_dist, 1.0 - wh_iou(pool, pool[index][None, :])[:, 0])
+
+    return np.asarray(centers, dtype=np.float64)
+
+
+# ESTIMATIVA DE ANCHORS
+def estimate_anchors(
+    boxes: np.ndarray,
+    k: int = ANCHOR_CLUSTERS,
+    iterations: int = ANCHOR_ITERATIONS,
+    batch_size: int = ANCHOR_BATCH_SIZE,
+    seed: int = ANCHOR_SEED,
+) -> Tuple[np.ndarray, float]:
+    """
+    Mini-batch k-means (distância 1 - IoU) sobre pares (w, h).
+
+    A cada iteração, um mini-batch é atribuído ao anchor de maior IoU
+    e cada anchor se move em direção à média das suas boxes com taxa
+    de aprendizado 1 / (boxes já atribuídas), como no mini-batch
+    k-means de Sculley. Clusters vazios são reinicializados.
+
+    Retorna (anchors ordenados por área, média do melhor IoU).
+    """
+
+    boxes = boxes[(boxes[:, 0] > 0) & (boxes[:, 1] > 0)]
+
+    if len(boxes) == 0:
+        logger.error("Nenhuma box com largura e altura positivas para estimar anchors.")
+        raise ValueError("Amostra de boxes vazia")
+
+    k = min(k, len(boxes))
+    rng = np.random.default_rng(seed)
+
+    centers = _init_centers(boxes, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+
+    for _ in range(iterations):
+        batch = boxes[rng.integers(len(boxes), size=min(batch_size, len(boxes)))]
+        assigned = np.argmax(wh_iou(batch, centers), axis=1)
+
+        batch_counts = np.bincount(assigned, minlength=k).astype(np.float64)
+        sums = np.stack([
+            np.bincount(assigned, weights=batch[:, 0], minlength=k),
+            np.bincount(assigned, weights=batch[:, 1], minlength=k),
+        ], axis=1)
+
+        hit = batch_counts > 0
+        counts[hit] += batch_counts[hit]
+        eta = batch_counts[hit] / counts[hit]
+        centers[hit] = (1.0 - eta)[:, None] * centers[hit] + eta[:, None] * (sums[hit] / batch_counts[hit, None])
+
+        # Anchors que nunca receberam boxes são reposicionados
+        dead = counts == 0
+
+        if dead.any():
+            centers[dead] = batch[rng.integers(len(batch), size=int(dead.sum()))]
+
+    centers = centers[np.argsort(centers[:, 0] * centers[:, 1])]
+    fitness = float(anchor_fitness(boxes, centers))
+
+    return centers, fitness
+
+
+def anchor_fitness(boxes: np.ndarray, anchors: np.ndarray, batch_size: int = ANCHOR_BATCH_SIZE) -> float:
+    """
+    Média, sobre as boxes, do melhor IoU com algum anchor.
+
+    Calculada em blocos para limitar a memória da matriz de IoU.
+    """
+
+    if len(boxes) == 0:
+        return 0.0
+
+    total = 0.0
+
+    for start in range(0, len(boxes), batch_size):
+        total += wh_iou(boxes[start:start + batch_size], anchors).max(axis=1).sum()
+
+    return total / len(boxes)
+
+
+def compute_anchor_metrics(sample_path: Path = BOX_SAMPLE_PATH) -> List[Tuple[str, str, object]]:
+    """
+    Estima anchors a partir da amostra salva pelo scan de métricas.
+
+    Retorna linhas (section, metric, value) no mesmo formato
+    de compute_dataset_metrics():
+
+    ("anchors", "k", 9)
+    ("anchors", "avg_best_iou", 0.71)
+    ("anchors", "anchor_1", [w, h])
+    ...
+    """
+
+    logger.info("Iniciando estimativa de anchors...")
+
+    if not sample_path.exists():
+        logger.error(f"Amostra de boxes não encontrada: {sample_path}")
+        raise FileNotFoundError(sample_path)
+
+    metrics: List[Tuple[str, str, object]] = []
+
+    try:
+        boxes = np.load(sample_path).reshape(-1, 2)
+        positive = (boxes[:, 0] > 0) & (boxes[:, 1] > 0)
+
+        # Amostra vazia ou apenas com boxes degeneradas: nada a estimar
+        if not positive.any():
+            logger.error(
+                f"Nenhuma box com largura e altura positivas na amostra ({len(boxes)} boxes): "
+                "anchors não estimados."
+            )
+            return metrics
+
+        anchors, fitness = estimate_anchors(boxes[positive])
+
+        metrics.extend([
+            ("anchors", "k", len(anchors)),
+            ("anchors", "sample_size", len(boxes)),
+            ("anchors", "avg_best_iou", fitness),
+        ])
+
+        for index, (w, h) in enumerate(anchors, start=1):
+            metrics.append(("anchors", f"anchor_{index}", [round(float(w), 6), round(float(h), 6)]))
+
+    except Exception as e:
+        logger.error("Erro ao estimar anchors:", exc_info=e)
+        raise
+
+    logger.info(f"Estimativa de anchors concluída | k: {len(anchors)} | IoU médio: {fitness:.4f}")
+    return metrics
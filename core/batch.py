@@ -0,0 +1,257 @@
+"""
+batch.py
+
+Responsável por executar o EDA sobre múltiplos datasets
+em um único processo de orquestração.
+
+Este módulo:
+- agenda validação e métricas de todos os datasets
+  em um único pool de processos compartilhado
+- grava os artifacts de cada dataset em um diretório próprio
+- consolida os resultados em uma tabela resumo (CSV)
+
+Falhas em um dataset são registradas no resumo
+e não interrompem os demais.
+"""
+
+import csv
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import (
+    ARTIFACTS_BATCH_DIR,
+    BATCH_MAX_WORKERS,
+    BATCH_SUMMARY_FILENAME,
+    BOX_HISTOGRAMS_FILENAME,
+    CLASS_COOCCURRENCE_FILENAME,
+    DATASET_METRICS_FILENAME,
+    ENABLE_PLOTS,
+    VALIDATION_SUMMARY_FILENAME
+)
+from core.metrics import compute_dataset_metrics, save_metrics_csv
+from core.validator import validate_dataset
+from utils.logging_global import setup_logging
+from viz.plots import (
+    plot_box_feature_histograms,
+    plot_box_geometry_stats,
+    plot_box_size_distribution,
+    plot_box_wh_density,
+    plot_boxes_per_image
+)
+
+logger = logging.getLogger(__name__)
+
+ISSUE_KEYS = ("labels_without_images", "images_without_labels", "invalid_labels")
+
+# Colunas do resumo -> (section, metric) no CSV de métricas.
+# As métricas por split (labels_<split>) repetem os nomes,
+# por isso a busca considera a seção.
+SUMMARY_METRICS = {
+    "images_with_objects": ("labels", "images_with_objects"),
+    "total_boxes": ("labels", "total_boxes"),
+    "small": ("box_sizes", "small"),
+    "medium": ("box_sizes", "medium"),
+    "large": ("box_sizes", "large"),
+    "width_mean": ("boxes", "width_mean"),
+    "height_mean": ("boxes", "height_mean"),
+    "area_mean": ("boxes", "area_mean"),
+    "proportion_mean": ("boxes", "proportion_mean"),
+}
+
+
+# FUNÇÕES AUXILIARES
+def _dataset_names(dataset_roots: List[Path]) -> List[str]:
+    """
+    Gera um nome único por dataset para o diretório de artifacts.
+
+    Datasets com o mesmo nome de pasta são prefixados pela pasta pai
+    (ex.: site01_dataset) e, persistindo a colisão, recebem sufixo numérico.
+
+    Os nomes vêm dos caminhos resolvidos: caminhos relativos como
+    ../site01 não geram diretórios "..".
+    """
+
+    resolved = [root.resolve() for root in dataset_roots]
+    basenames = [root.name or "dataset" for root in resolved]
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+
+    for root, basename in zip(resolved, basenames):
+        base = basename
+
+        if basenames.count(basename) > 1 and root.parent.name:
+            base = f"{root.parent.name}_{basename}"
+
+        count = seen.get(base, 0)
+        seen[base] = count + 1
+        names.append(base if count == 0 else f"{base}_{count + 1}")
+
+    return names
+
+
+# TAREFAS EXECUTADAS NOS WORKERS
+def _validation_task(dataset_dir: Path, output_dir: Path) -> Dict[str, int]:
+    """
+    Valida um dataset e salva o resumo por split em CSV.
+
+    Retorna o total de cada tipo de problema.
+    """
+
+    report = validate_dataset(dataset_dir)
+    metrics_dir = output_dir / "metrics"
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(metrics_dir / VALIDATION_SUMMARY_FILENAME, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(["split", *ISSUE_KEYS])
+
+        for split, issues in report.items():
+            writer.writerow([split, *(len(issues[key]) for key in ISSUE_KEYS)])
+
+    return {key: sum(len(issues[key]) for issues in report.values()) for key in ISSUE_KEYS}
+
+
+def _metrics_task(dataset_dir: Path, output_dir: Path) -> Dict[str, object]:
+    """
+    Calcula e salva as métricas de um dataset (e os plots, se habilitados).
+
+    Retorna as colunas de SUMMARY_METRICS no formato {coluna: valor}.
+    """
+
+    metrics_dir = output_dir / "metrics"
+    plots_dir = output_dir / "plots"
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+
+    histograms_path = metrics_dir / BOX_HISTOGRAMS_FILENAME
+    metrics = compute_dataset_metrics(
+        dataset_dir,
+        histograms_path=histograms_path,
+        cooccurrence_path=metrics_dir / CLASS_COOCCURRENCE_FILENAME,
+    )
+
+    csv_path = metrics_dir / DATASET_METRICS_FILENAME
+    save_metrics_csv(metrics, csv_path)
+
+    if ENABLE_PLOTS and metrics:
+        plots_dir.mkdir(parents=True, exist_ok=True)
+
+        plot_box_geometry_stats(
+            csv_path=csv_path,
+            output_path=plots_dir / "box_geometry_stats.png",
+        )
+
+        plot_box_size_distribution(
+            csv_path=csv_path,
+            output_path=plots_dir / "box_size_distribution.png",
+        )
+
+        plot_box_feature_histograms(
+            npz_path=histograms_path,
+            output_path=plots_dir / "box_feature_histograms.png",
+        )
+
+        plot_box_wh_density(
+            npz_path=histograms_path,
+            output_path=plots_dir / "box_wh_density.png",
+        )
+
+        plot_boxes_per_image(
+            npz_path=histograms_path,
+            output_path=plots_dir / "boxes_per_image.png",
+        )
+
+    values = {(section, metric): value for section, metric, value in metrics}
+
+    return {column: values.get(key, "") for column, key in SUMMARY_METRICS.items()}
+
+
+# EXECUÇÃO EM LOTE
+def run_batch(
+    dataset_roots: List[Path],
+    output_dir: Path = ARTIFACTS_BATCH_DIR,
+    max_workers: Optional[int] = BATCH_MAX_WORKERS,
+) -> List[Dict[str, object]]:
+    """
+    Executa validação e métricas de vários datasets
+    em um único pool de processos.
+
+    Cada dataset gera artifacts em output_dir/<nome>/
+    e uma linha na tabela output_dir/batch_summary.csv.
+
+    Retorna as linhas da tabela resumo.
+    """
+
+    logger.info(f"Iniciando EDA em lote para {len(dataset_roots)} datasets")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    names = _dataset_names(dataset_roots)
+
+    rows: Dict[str, Dict[str, object]] = {
+        name: {"dataset": name, "dataset_dir": str(root), "status": "ok", "error": ""}
+        for name, root in zip(names, dataset_roots)
+    }
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=setup_logging) as pool:
+            futures: Dict[Future, Tuple[str, str]] = {}
+
+            for name, root in zip(names, dataset_roots):
+                if not root.exists():
+                    logger.warning(f"Dataset não encontrado: {root}")
+                    rows[name].update(status="error", error="dataset não encontrado")
+                    continue
+
+                dataset_output = output_dir / name
+                futures[pool.submit(_validation_task, root, dataset_output)] = (name, "validation")
+                futures[pool.submit(_metrics_task, root, dataset_output)] = (name, "metrics")
+
+            for future in as_completed(futures):
+                name, task = futures[future]
+
+                try:
+                    result = future.result()
+
+                except Exception as e:
+                    logger.error(f"Falha na etapa {task} do dataset {name}:", exc_info=e)
+                    rows[name].update(status="error", error=f"{task}: {e}")
+                    continue
+
+                rows[name].update(result)
+
+                logger.info(f"Etapa {task} concluída para o dataset {name}")
+
+    except Exception as e:
+        logger.error("Erro durante a execução em lote:", exc_info=e)
+        raise
+
+    summary = [rows[name] for name in names]
+    save_batch_summary(summary, output_dir / BATCH_SUMMARY_FILENAME)
+
+    failed = sum(1 for row in summary if row["status"] != "ok")
+    logger.info(f"EDA em lote concluído | datasets: {len(summary)} | com falha: {failed}")
+
+    return summary
+
+
+def save_batch_summary(summary: List[Dict[str, object]], output_path: Path) -> None:
+    """
+    Salva a tabela resumo do lote (uma linha por dataset).
+
+    Assume que o diretório já existe.
+    """
+
+    columns = ["dataset", "dataset_dir", "status", "error", *ISSUE_KEYS, *SUMMARY_METRICS]
+
+    try:
+        with open(output_path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=columns, restval="")
+            writer.writeheader()
+            writer.writerows(summary)
+
+        logger.info(f"Resumo do lote salvo em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao salvar resumo do lote:", exc_info=e)
+        raise
@@ -0,0 +1,243 @@
+"""
+dataset_diff.py
+
+Responsável por comparar dois estados do dataset
+(ver dataset_state.py) e gerar o relatório de mudanças.
+
+O relatório contém, por split:
+- arquivos adicionados, removidos e modificados (imagens e labels)
+- variação na contagem de boxes
+- drift das distribuições geométricas das boxes (KS e PSI)
+
+KS e PSI são calculados sobre os histogramas de bins fixos já
+totalizados em cada estado, sem reler os labels nem manter as
+amostras brutas de ambas as versões.
+"""
+
+import csv
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from config.settings import (
+    DATASET_DIFF_FILENAME,
+    DATASET_DIFF_FILES_FILENAME,
+    DATASET_SPLITS,
+    HISTOGRAM_BINS,
+    PSI_EPSILON
+)
+from core.dataset_state import DatasetState
+from core.metrics import BOX_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# Split ausente em um dos estados
+_EMPTY_SPLIT = {
+    "images": {},
+    "labels": {},
+    "histograms": [[0] * HISTOGRAM_BINS for _ in BOX_FEATURES],
+}
+
+
+# FUNÇÕES AUXILIARES
+def _box_histograms(split_state: Dict[str, object]) -> Dict[str, np.ndarray]:
+    """
+    Histogramas de bins fixos das features das boxes de um split,
+    totalizados no estado (mesmos bins do scan de métricas).
+    """
+
+    histograms = np.asarray(split_state["histograms"], dtype=np.int64)
+
+    return dict(zip(BOX_FEATURES, histograms))
+
+
+def _ks_statistic(old_hist: np.ndarray, new_hist: np.ndarray) -> float:
+    """
+    Estatística de Kolmogorov-Smirnov sobre histogramas:
+    maior distância entre as CDFs empíricas dos bins.
+    """
+
+    if old_hist.sum() == 0 or new_hist.sum() == 0:
+        return 0.0
+
+    old_cdf = np.cumsum(old_hist) / old_hist.sum()
+    new_cdf = np.cumsum(new_hist) / new_hist.sum()
+
+    return float(np.max(np.abs(old_cdf - new_cdf)))
+
+
+def _psi(old_hist: np.ndarray, new_hist: np.ndarray) -> float:
+    """
+    Population Stability Index entre dois histogramas.
+
+    Bins vazios recebem PSI_EPSILON para evitar log(0).
+    """
+
+    if old_hist.sum() == 0 or new_hist.sum() == 0:
+        return 0.0
+
+    old_p = np.maximum(old_hist / old_hist.sum(), PSI_EPSILON)
+    new_p = np.maximum(new_hist / new_hist.sum(), PSI_EPSILON)
+
+    return float(np.sum((new_p - old_p) * np.log(new_p / old_p)))
+
+
+# COMPARAÇÃO DE ESTADOS
+def diff_dataset_states(old: DatasetState, new: DatasetState) -> Dict[str, Dict[str, object]]:
+    """
+    Compara dois estados do dataset por split.
+
+    Retorna um dicionário no formato:
+
+    {
+        "train": {
+            "images_added": [...],
+            "images_removed": [...],
+            "images_modified": [...],
+            "labels_added": [...],
+            "labels_removed": [...],
+            "labels_modified": [...],
+            "box_changes": [(label, boxes_old, boxes_new), ...],
+            "boxes_old": 100,
+            "boxes_new": 120,
+            "drift": {"width": {"ks": 0.01, "psi": 0.002}, ...}
+        }
+    }
+
+    Labels são considerados modificados quando o hash do conteúdo muda.
+    Imagens são comparadas apenas por tamanho e mtime.
+    """
+
+    logger.info("Comparando estados do dataset...")
+
+    if old.get("histogram") != new.get("histogram"):
+        logger.error("Os estados usam bins de histograma diferentes; refaça o snapshot antigo")
+        raise ValueError("Estados do dataset com bins de histograma incompatíveis")
+
+    report: Dict[str, Dict[str, object]] = {}
+
+    try:
+        for split in DATASET_SPLITS:
+            old_split = old["splits"].get(split, _EMPTY_SPLIT)
+            new_split = new["splits"].get(split, _EMPTY_SPLIT)
+
+            old_images = old_split["images"]
+            new_images = new_split["images"]
+            old_labels = old_split["labels"]
+            new_labels = new_split["labels"]
+
+            common_labels = sorted(old_labels.keys() & new_labels.keys())
+
+            labels_modified = [
+                name for name in common_labels
+                if old_labels[name]["sha1"] != new_labels[name]["sha1"]
+            ]
+
+            box_changes: List[Tuple[str, int, int]] = []
+
+            for name in sorted(old_labels.keys() | new_labels.keys()):
+                boxes_old = old_labels[name]["boxes"] if name in old_labels else 0
+                boxes_new = new_labels[name]["boxes"] if name in new_labels else 0
+
+                if boxes_old != boxes_new:
+                    box_changes.append((name, boxes_old, boxes_new))
+
+            old_hists = _box_histograms(old_split)
+            new_hists = _box_histograms(new_split)
+
+            drift = {
+                feature: {
+                    "ks": _ks_statistic(old_hists[feature], new_hists[feature]),
+                    "psi": _psi(old_hists[feature], new_hists[feature]),
+                }
+                for feature in BOX_FEATURES
+            }
+
+            report[split] = {
+                "images_added": sorted(new_images.keys() - old_images.keys()),
+                "images_removed": sorted(old_images.keys() - new_images.keys()),
+                "images_modified": [
+                    name for name in sorted(old_images.keys() & new_images.keys())
+                    if old_images[name] != new_images[name]
+                ],
+                "labels_added": sorted(new_labels.keys() - old_labels.keys()),
+                "labels_removed": sorted(old_labels.keys() - new_labels.keys()),
+                "labels_modified": labels_modified,
+                "box_changes": box_changes,
+                "boxes_old": int(sum(e["boxes"] for e in old_labels.values())),
+                "boxes_new": int(sum(e["boxes"] for e in new_labels.values())),
+                "drift": drift,
+            }
+
+            logger.info(
+                "Split %s | labels +%d -%d ~%d | boxes %d -> %d",
+                split,
+                len(report[split]["labels_added"]),
+                len(report[split]["labels_removed"]),
+                len(labels_modified),
+                report[split]["boxes_old"],
+                report[split]["boxes_new"],
+            )
+
+    except Exception as e:
+        logger.error("Erro ao comparar estados do dataset:", exc_info=e)
+        raise
+
+    logger.info("Comparação de estados do dataset concluída.")
+    return report
+
+
+# PERSISTÊNCIA
+def save_diff_reports(report: Dict[str, Dict[str, object]], output_dir: Path) -> None:
+    """
+    Salva o relatório de diff em dois CSVs dentro de output_dir:
+
+    - dataset_diff.csv: resumo no formato longo (section, metric, value)
+    - dataset_diff_files.csv: detalhamento por arquivo
+
+    Assume que o diretório já existe.
+    """
+
+    summary_path = output_dir / DATASET_DIFF_FILENAME
+    files_path = output_dir / DATASET_DIFF_FILES_FILENAME
+
+    try:
+        with open(summary_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["section", "metric", "value"])
+
+            for split, changes in report.items():
+                for key in (
+                    "images_added", "images_removed", "images_modified",
+                    "labels_added", "labels_removed", "labels_modified",
+                ):
+                    writer.writerow([f"files_{split}", key, len(changes[key])])
+
+                writer.writerow([f"boxes_{split}", "boxes_old", changes["boxes_old"]])
+                writer.writerow([f"boxes_{split}", "boxes_new", changes["boxes_new"]])
+                writer.writerow([f"boxes_{split}", "files_with_box_changes", len(changes["box_changes"])])
+
+                for feature, stats in changes["drift"].items():
+                    writer.writerow([f"drift_{split}", f"{feature}_ks", stats["ks"]])
+                    writer.writerow([f"drift_{split}", f"{feature}_psi", stats["psi"]])
+
+        with open(files_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["split", "kind", "file", "change", "boxes_old", "boxes_new"])
+
+            for split, changes in report.items():
+                box_counts = {name: (old, new) for name, old, new in changes["box_changes"]}
+
+                for kind in ("images", "labels"):
+                    for change in ("added", "removed", "modified"):
+                        for name in changes[f"{kind}_{change}"]:
+                            boxes_old, boxes_new = box_counts.get(name, ("", ""))
+                            writer.writerow([split, kind, name, change, boxes_old, boxes_new])
+
+        logger.info(f"Relatório de diff salvo em: {summary_path} e {files_path}")
+
+    except Exception as e:
+        logger.error("Erro ao salvar relatório de diff:", exc_info=e)
+        raise
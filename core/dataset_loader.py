@@ -8,8 +8,11 @@ Este módulo:
 - apenas lê o filesystem
 """
 
+import hashlib
 import logging
-from typing import Dict
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
 
 from config.settings import(
     DATASET_DIR, 
@@ -17,10 +20,69 @@ from config.settings import(
     IMAGES_DIRNAME, 
     LABELS_DIRNAME
 )
+from utils.spill import SortedRunSet
 
 logger = logging.getLogger(__name__)
 
-def load_dataset_structure() -> Dict[str, Dict[str, int]]:
+
+def iter_dir_names(directory: Path) -> Iterator[str]:
+    """
+    Itera os nomes das entradas de um diretório sem materializar a listagem.
+
+    Produz as mesmas entradas que glob("*"), inclusive as ocultas
+    (ex.: .DS_Store). Diretórios ausentes não produzem nomes.
+    """
+
+    if not directory.exists():
+        return
+
+    with os.scandir(directory) as it:
+        for entry in it:
+            yield entry.name
+
+
+def sorted_dir_names(
+    directory: Path,
+    suffix: Optional[str] = None,
+    max_items: Optional[int] = None,
+) -> SortedRunSet:
+    """
+    Lista os nomes de um diretório em ordem determinística.
+
+    A ordem estável permite registrar offsets de processamento
+    (checkpoints) e a listagem respeita o limite de memória.
+    """
+
+    names = SortedRunSet(max_items)
+    names.update(
+        name for name in iter_dir_names(directory)
+        if suffix is None or name.endswith(suffix)
+    )
+
+    return names
+
+
+def listing_fingerprint(directory: Path, names: Iterable[str]) -> str:
+    """
+    Hash (sha256) de nome, tamanho e mtime das entradas informadas.
+
+    Não lê o conteúdo dos arquivos; qualquer arquivo adicionado,
+    removido ou modificado altera o fingerprint.
+    """
+
+    digest = hashlib.sha256()
+
+    for name in names:
+        try:
+            st = os.stat(directory / name)
+            digest.update(f"{name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+
+        except OSError:
+            digest.update(f"{name}:missing\n".encode())
+
+    return digest.hexdigest()
+
+def load_dataset_structure(dataset_dir: Path = DATASET_DIR) -> Dict[str, Dict[str, int]]:
     """
     Percorre o dataset e coleta informações básicas por split.
 
@@ -50,8 +112,8 @@ def load_dataset_structure() -> Dict[str, Dict[str, int]]:
             logger.info(f"Processando split: {split}")
             
             # Montamos os caminhos esperados
-            images_path = DATASET_DIR / split / IMAGES_DIRNAME
-            labels_path = DATASET_DIR / split / LABELS_DIRNAME
+            images_path = dataset_dir / split / IMAGES_DIRNAME
+            labels_path = dataset_dir / split / LABELS_DIRNAME
 
             # Verificamos se os diretórios existem
             if not images_path.exists():
@@ -0,0 +1,357 @@
+"""
+dataset_state.py
+
+Responsável por capturar e persistir o estado (snapshot) de uma
+versão do dataset para comparação posterior entre versões.
+
+O estado guarda, por split:
+- imagens: tamanho e mtime de cada arquivo
+- labels: tamanho, mtime, hash do conteúdo, número de boxes válidas e
+  histograma esparso das features das boxes (bins de box_feature_histograms)
+- histogramas: totais por feature das boxes do split
+
+As boxes em si não são guardadas: o tamanho do estado depende do número
+de arquivos, não do número de boxes.
+
+Ao construir um novo estado a partir de um estado anterior,
+labels com mesmo tamanho e mtime reaproveitam o resultado em cache,
+de modo que apenas os arquivos alterados são lidos e parseados; os
+totais do split são atualizados subtraindo os bins dos labels alterados
+ou removidos e somando os dos labels novos.
+
+Este módulo:
+- apenas lê o dataset
+- escreve somente o arquivo JSON do estado
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.settings import (
+    BOX_HISTOGRAM_RANGES,
+    DATASET_DIR,
+    DATASET_SPLITS,
+    HISTOGRAM_BINS,
+    IMAGES_DIRNAME,
+    LABELS_DIRNAME
+)
+from core.dataset_loader import sorted_dir_names
+from core.metrics import BOX_FEATURES, box_feature_histograms
+
+logger = logging.getLogger(__name__)
+
+DatasetState = Dict[str, object]
+
+STATE_VERSION = 2
+
+# Bins por feature de um label: [[bin, contagem], ...] (apenas bins não vazios)
+LabelBins = List[List[List[int]]]
+
+
+# FUNÇÕES AUXILIARES
+def _scan_dir(directory: Path, suffix: Optional[str] = None) -> Dict[str, os.stat_result]:
+    """
+    Lista arquivos regulares de um diretório com seus metadados.
+
+    Diretórios ausentes retornam dicionário vazio.
+    """
+
+    if not directory.exists():
+        logger.warning(f"Pasta não encontrada: {directory}")
+        return {}
+
+    entries: Dict[str, os.stat_result] = {}
+
+    with os.scandir(directory) as it:
+        for entry in it:
+            if not entry.is_file():
+                continue
+
+            if suffix is not None and not entry.name.endswith(suffix):
+                continue
+
+            entries[entry.name] = entry.stat()
+
+    return entries
+
+
+def _histogram_config() -> Dict[str, object]:
+    """
+    Parâmetros dos bins dos histogramas; estados com bins
+    diferentes não podem ser combinados nem comparados.
+    """
+
+    return {
+        "bins": HISTOGRAM_BINS,
+        "ranges": {feature: list(BOX_HISTOGRAM_RANGES[feature]) for feature in BOX_FEATURES},
+    }
+
+
+def _parse_label(content: bytes) -> Tuple[int, LabelBins]:
+    """
+    Extrai de um label YOLO o número de boxes válidas e o
+    histograma esparso de suas features.
+
+    Segue as mesmas regras de compute_dataset_metrics():
+    linhas sem 5 valores ou com valores não numéricos são ignoradas.
+    """
+
+    sizes: List[Tuple[float, float]] = []
+
+    for line in content.decode("utf-8", errors="replace").strip().splitlines():
+        parts = line.split()
+
+        if len(parts) != 5:
+            continue
+
+        try:
+            _, _, _, w, h = parts
+            sizes.append((float(w), float(h)))
+
+        except ValueError:
+            continue
+
+    data = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+    histograms = box_feature_histograms(data[:, 0], data[:, 1])
+
+    bins = [
+        [[int(index), int(histogram[index])] for index in np.flatnonzero(histogram)]
+        for histogram in histograms
+    ]
+
+    return len(sizes), bins
+
+
+def _apply_bins(totals: np.ndarray, bins: LabelBins, sign: int) -> None:
+    """
+    Soma (sign=1) ou subtrai (sign=-1) o histograma esparso
+    de um label dos totais do split.
+    """
+
+    for feature_index, pairs in enumerate(bins):
+        for index, count in pairs:
+            totals[feature_index, index] += sign * count
+
+
+# FINGERPRINT
+def dataset_fingerprint(dataset_dir: Path = DATASET_DIR) -> str:
+    """
+    Hash (sha256) da listagem do dataset: nome, tamanho e mtime
+    de cada imagem e label, por split.
+
+    Não lê o conteúdo dos arquivos; qualquer arquivo adicionado,
+    removido ou modificado altera o fingerprint. A listagem ordenada
+    respeita MEMORY_BUDGET_MB.
+    """
+
+    digest = hashlib.sha256()
+
+    for split in DATASET_SPLITS:
+        for dirname in (IMAGES_DIRNAME, LABELS_DIRNAME):
+            directory = dataset_dir / split / dirname
+
+            if not directory.exists():
+                digest.update(f"{split}/{dirname}:missing\n".encode())
+                continue
+
+            names = sorted_dir_names(directory)
+
+            for name in names:
+                st = os.stat(directory / name)
+                digest.update(f"{split}/{dirname}/{name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+
+            names.close()
+
+    return digest.hexdigest()
+
+
+# CONSTRUÇÃO DO ESTADO
+def build_dataset_state(
+    dataset_dir: Path = DATASET_DIR,
+    previous: Optional[DatasetState] = None,
+) -> DatasetState:
+    """
+    Captura o estado atual do dataset.
+
+    Se `previous` for informado, labels cujo tamanho e mtime
+    não mudaram reaproveitam hash, boxes e bins do estado anterior,
+    e os totais do split partem dos totais anteriores.
+
+    Retorna um dicionário serializável em JSON:
+
+    {
+        "dataset_dir": "...",
+        "created_at": "...",
+        "histogram": {"bins": 50, "ranges": {"width": [0.0, 1.0], ...}},
+        "splits": {
+            "train": {
+                "images": {"img.jpg": [size, mtime_ns]},
+                "labels": {
+                    "img.txt": {
+                        "size": 120,
+                        "mtime_ns": 0,
+                        "sha1": "...",
+                        "boxes": 3,
+                        "bins": [[[bin, count], ...], ...]
+                    }
+                },
+                "histograms": [[count, ...], ...]
+            }
+        }
+    }
+
+    Em "bins" e "histograms", a ordem das features é BOX_FEATURES.
+    """
+
+    logger.info(f"Capturando estado do dataset: {dataset_dir}")
+
+    histogram_config = _histogram_config()
+    previous_splits = previous.get("splits", {}) if previous else {}
+
+    if previous and previous.get("histogram") != histogram_config:
+        logger.warning("Estado anterior usa outros bins de histograma; todos os labels serão relidos")
+        previous_splits = {}
+
+    splits: Dict[str, Dict[str, object]] = {}
+    reused = 0
+    parsed = 0
+
+    try:
+        for split in DATASET_SPLITS:
+            images_dir = dataset_dir / split / IMAGES_DIRNAME
+            labels_dir = dataset_dir / split / LABELS_DIRNAME
+
+            images = {
+                name: [st.st_size, st.st_mtime_ns]
+                for name, st in sorted(_scan_dir(images_dir).items())
+            }
+
+            previous_split = previous_splits.get(split, {})
+            cached_labels = previous_split.get("labels", {})
+            labels: Dict[str, Dict[str, object]] = {}
+
+            if cached_labels:
+                totals = np.asarray(previous_split["histograms"], dtype=np.int64)
+            else:
+                totals = np.zeros((len(BOX_FEATURES), HISTOGRAM_BINS), dtype=np.int64)
+
+            listing = _scan_dir(labels_dir, ".txt")
+
+            # Labels removidos saem dos totais
+            for name in cached_labels.keys() - listing.keys():
+                _apply_bins(totals, cached_labels[name]["bins"], -1)
+
+            for name, st in sorted(listing.items()):
+                cached = cached_labels.get(name)
+
+                # Arquivo inalterado: reaproveita o resultado em cache
+                if (
+                    cached is not None
+                    and cached["size"] == st.st_size
+                    and cached["mtime_ns"] == st.st_mtime_ns
+                ):
+                    labels[name] = cached
+                    reused += 1
+                    continue
+
+                # Arquivo alterado: sai dos totais e é relido
+                if cached is not None:
+                    _apply_bins(totals, cached["bins"], -1)
+
+                label_file = labels_dir / name
+
+                try:
+                    content = label_file.read_bytes()
+
+                except Exception as e:
+                    logger.warning(f"Não foi possível ler o arquivo {label_file}: {e}")
+                    continue
+
+                box_count, bins = _parse_label(content)
+                _apply_bins(totals, bins, 1)
+
+                labels[name] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha1": hashlib.sha1(content).hexdigest(),
+                    "boxes": box_count,
+                    "bins": bins,
+                }
+                parsed += 1
+
+            splits[split] = {"images": images, "labels": labels, "histograms": totals.tolist()}
+
+            logger.info(
+                "Split %s | imagens: %d | labels: %d",
+                split,
+                len(images),
+                len(labels),
+            )
+
+    except Exception as e:
+        logger.error("Erro ao capturar estado do dataset:", exc_info=e)
+        raise
+
+    logger.info(
+        "Estado do dataset capturado | labels reaproveitados do cache: %d | labels parseados: %d",
+        reused,
+        parsed,
+    )
+
+    return {
+        "version": STATE_VERSION,
+        "dataset_dir": str(dataset_dir),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "histogram": histogram_config,
+        "splits": splits,
+    }
+
+
+# PERSISTÊNCIA
+def save_dataset_state(state: DatasetState, output_path: Path) -> None:
+    """
+    Salva o estado do dataset em JSON.
+
+    Assume que o diretório de destino já existe.
+    """
+
+    try:
+        with open(output_path, "w") as f:
+            json.dump(state, f)
+
+        logger.info(f"Estado do dataset salvo em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao salvar estado do dataset:", exc_info=e)
+        raise
+
+
+def load_dataset_state(state_path: Path) -> DatasetState:
+    """
+    Carrega um estado do dataset previamente salvo.
+    """
+
+    if not state_path.exists():
+        logger.error(f"Estado do dataset não encontrado: {state_path}")
+        raise FileNotFoundError(state_path)
+
+    try:
+        with open(state_path, "r") as f:
+            state = json.load(f)
+
+    except Exception as e:
+        logger.error(f"Erro ao carregar estado do dataset {state_path}:", exc_info=e)
+        raise
+
+    if state.get("version") != STATE_VERSION:
+        logger.error(f"Versão de estado incompatível em {state_path}: {state.get('version')}")
+        raise ValueError("Versão de estado do dataset incompatível")
+
+    return state
@@ -0,0 +1,430 @@
+"""
+image_stats.py
+
+Responsável por calcular estatísticas de pixels das imagens do dataset:
+brilho, contraste, saturação e nitidez (blur score).
+
+Este módulo:
+- decodifica cada imagem em resolução reduzida (draft do Pillow para JPEG,
+  seguido de thumbnail), sem decodificar o frame completo
+- distribui a decodificação em um pool de processos
+- mantém um cache por arquivo (tamanho e mtime) em SQLite, gravado a
+  cada chunk, de modo que apenas imagens novas ou alteradas são
+  decodificadas novamente, inclusive após uma execução interrompida
+- agrega os valores de cada split em sketches (histogramas de largura
+  fixa), dos quais são estimados os quantis
+
+Estatísticas por imagem (sobre a versão reduzida):
+- brightness: média da luminância (0-255)
+- contrast:   desvio padrão da luminância
+- saturation: média do canal S (HSV, 0-255)
+- blur_score: log10(1 + variância do Laplaciano da luminância);
+              valores baixos indicam imagens borradas
+"""
+
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from config.settings import (
+    CHUNK_SIZE_FILES,
+    DATASET_DIR,
+    DATASET_SPLITS,
+    IMAGE_STATS_CACHE_DIR,
+    IMAGE_STATS_MAX_SIDE,
+    IMAGE_STATS_MAX_WORKERS,
+    IMAGE_STATS_QUANTILES,
+    IMAGE_STATS_RANGES,
+    IMAGE_STATS_SKETCH_BINS,
+    IMAGES_DIRNAME,
+    MEMORY_BUDGET_SHARES
+)
+from core.dataset_loader import sorted_dir_names
+from utils.spill import budget_items
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FEATURES = tuple(IMAGE_STATS_RANGES)
+
+CACHE_VERSION = 2
+
+# Imagens enviadas a cada worker por vez
+_POOL_CHUNKSIZE = 16
+
+
+# DECODIFICAÇÃO (EXECUTADA NOS WORKERS)
+def pixel_stats(image_path: str, max_side: int = IMAGE_STATS_MAX_SIDE) -> Optional[List[float]]:
+    """
+    Calcula as estatísticas de uma imagem em resolução reduzida.
+
+    Retorna [brightness, contrast, saturation, blur_score],
+    ou None se a imagem não puder ser decodificada.
+    """
+
+    try:
+        with Image.open(image_path) as img:
+            # JPEG: a redução acontece na própria decodificação (escala 1/2, 1/4, 1/8)
+            img.draft("RGB", (max_side, max_side))
+            img.thumbnail((max_side, max_side))
+            rgb = img.convert("RGB")
+
+    except Exception:
+        return None
+
+    luma = np.asarray(rgb.convert("L"), dtype=np.float32)
+    saturation = np.asarray(rgb.convert("HSV"), dtype=np.float32)[..., 1]
+
+    blur_score = 0.0
+
+    if luma.shape[0] >= 3 and luma.shape[1] >= 3:
+        laplacian = (
+            luma[:-2, 1:-1] + luma[2:, 1:-1] + luma[1:-1, :-2] + luma[1:-1, 2:]
+            - 4.0 * luma[1:-1, 1:-1]
+        )
+        blur_score = math.log10(1.0 + float(laplacian.var()))
+
+    return [float(luma.mean()), float(luma.std()), float(saturation.mean()), blur_score]
+
+
+# SKETCH POR SPLIT
+class ImageStatsSketch:
+    """
+    Resumo de tamanho fixo das estatísticas de um split.
+
+    Guarda, por estatística, um histograma de IMAGE_STATS_SKETCH_BINS
+    bins sobre IMAGE_STATS_RANGES, além de soma, mínimo e máximo exatos.
+    A memória independe do número de imagens e sketches podem ser somados.
+    """
+
+    def __init__(self, bins: int = IMAGE_STATS_SKETCH_BINS) -> None:
+        self.bins = bins
+        self.counts = np.zeros((len(IMAGE_FEATURES), bins), dtype=np.int64)
+        self.total = 0
+        self.sums = np.zeros(len(IMAGE_FEATURES), dtype=np.float64)
+        self.mins = np.full(len(IMAGE_FEATURES), np.inf)
+        self.maxs = np.full(len(IMAGE_FEATURES), -np.inf)
+
+    def add(self, values: np.ndarray) -> None:
+        """
+        Acrescenta uma matriz (n, len(IMAGE_FEATURES)) de estatísticas.
+        """
+
+        if len(values) == 0:
+            return
+
+        self.total += len(values)
+        self.sums += values.sum(axis=0)
+        self.mins = np.minimum(self.mins, values.min(axis=0))
+        self.maxs = np.maximum(self.maxs, values.max(axis=0))
+
+        for index, feature in enumerate(IMAGE_FEATURES):
+            low, high = IMAGE_STATS_RANGES[feature]
+            positions = ((values[:, index] - low) / (high - low) * self.bins).astype(np.int64)
+            np.clip(positions, 0, self.bins - 1, out=positions)
+            self.counts[index] += np.bincount(positions, minlength=self.bins)
+
+    def quantile(self, index: int, q: float) -> float:
+        """
+        Quantil estimado por interpolação linear dentro do bin,
+        limitado ao mínimo e máximo observados.
+        """
+
+        counts = self.counts[index]
+        cumulative = np.cumsum(counts)
+        target = q * self.total
+        position = min(int(np.searchsorted(cumulative, target)), self.bins - 1)
+        previous = cumulative[position - 1] if position > 0 else 0
+        fraction = (target - previous) / counts[position] if counts[position] else 0.0
+
+        low, high = IMAGE_STATS_RANGES[IMAGE_FEATURES[index]]
+        value = low + (position + fraction) * (high - low) / self.bins
+
+        return float(min(max(value, self.mins[index]), self.maxs[index]))
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        return {
+            f"{prefix}_counts": self.counts,
+            f"{prefix}_total": np.asarray(self.total),
+            f"{prefix}_sums": self.sums,
+            f"{prefix}_mins": self.mins,
+            f"{prefix}_maxs": self.maxs,
+        }
+
+
+# CACHE POR ARQUIVO
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    stats TEXT,
+    run INTEGER NOT NULL
+);
+"""
+
+
+def _meta_value(connection: sqlite3.Connection, key: str) -> Optional[int]:
+    row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _open_cache(cache_path: Path) -> Tuple[sqlite3.Connection, int]:
+    """
+    Abre o cache de um split e inicia uma nova execução.
+
+    Tabela files: {imagem: size, mtime_ns, stats (JSON | NULL), run}.
+    Caches de outra versão, resolução ou ilegíveis são descartados.
+
+    Retorna (conexão, id da execução).
+    """
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        connection = sqlite3.connect(cache_path)
+        connection.executescript(CACHE_SCHEMA)
+
+    except sqlite3.DatabaseError as e:
+        logger.warning(f"Cache de estatísticas de pixels ilegível, ignorando {cache_path}: {e}")
+        connection.close()
+        cache_path.unlink()
+        connection = sqlite3.connect(cache_path)
+        connection.executescript(CACHE_SCHEMA)
+
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    version = _meta_value(connection, "version")
+
+    if version != CACHE_VERSION or _meta_value(connection, "max_side") != IMAGE_STATS_MAX_SIDE:
+        if version is not None:
+            logger.info(f"Cache de estatísticas de pixels desatualizado, ignorando: {cache_path}")
+
+        with connection:
+            connection.execute("DELETE FROM files")
+            connection.execute("DELETE FROM meta")
+            connection.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("version", CACHE_VERSION), ("max_side", IMAGE_STATS_MAX_SIDE)],
+            )
+
+    run = (_meta_value(connection, "run") or 0) + 1
+
+    with connection:
+        connection.execute("INSERT OR REPLACE INTO meta VALUES ('run', ?)", (run,))
+
+    return connection, run
+
+
+def _close_cache(connection: sqlite3.Connection, run: int) -> None:
+    """
+    Encerra a execução: remove imagens não vistas nesta execução
+    (removidas do dataset) e fecha o cache.
+    """
+
+    with connection:
+        removed = connection.execute("DELETE FROM files WHERE run != ?", (run,)).rowcount
+
+    if removed:
+        logger.info(f"Cache de estatísticas de pixels: {removed} imagens removidas")
+
+    connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    connection.close()
+
+
+# FUNÇÕES AUXILIARES
+def _process_chunk(
+    pool: ProcessPoolExecutor,
+    images_dir: Path,
+    names: List[str],
+    cache: sqlite3.Connection,
+    run: int,
+    sketch: ImageStatsSketch,
+) -> Tuple[int, int, int]:
+    """
+    Processa um chunk de imagens de um split.
+
+    Imagens inalteradas vêm do cache; as demais são decodificadas no pool.
+    Imagens removidas após a listagem contam como ilegíveis.
+    Atualiza o cache (uma transação por chunk) e `sketch`.
+
+    Retorna (decodificadas, reaproveitadas, ilegíveis).
+    """
+
+    results: List[Optional[List[float]]] = []
+    reused_names: List[Tuple[int, str]] = []
+    pending: List[Tuple[str, int, int]] = []
+
+    for name in names:
+        try:
+            st = os.stat(images_dir / name)
+
+        except OSError as e:
+            logger.warning(f"Não foi possível ler a imagem {images_dir / name}: {e}")
+            results.append(None)
+            continue
+
+        cached = cache.execute(
+            "SELECT size, mtime_ns, stats FROM files WHERE name = ?", (name,)
+        ).fetchone()
+
+        # Arquivo inalterado: reaproveita o resultado em cache
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            reused_names.append((run, name))
+            results.append(json.loads(cached[2]) if cached[2] is not None else None)
+        else:
+            pending.append((name, st.st_size, st.st_mtime_ns))
+
+    paths = [str(images_dir / name) for name, _, _ in pending]
+    rows: List[Tuple[str, int, int, Optional[str], int]] = []
+
+    for (name, size, mtime_ns), stats in zip(pending, pool.map(pixel_stats, paths, chunksize=_POOL_CHUNKSIZE)):
+        if stats is None:
+            logger.warning(f"Não foi possível decodificar a imagem {images_dir / name}")
+
+        rows.append((name, size, mtime_ns, json.dumps(stats) if stats is not None else None, run))
+        results.append(stats)
+
+    with cache:
+        cache.executemany("UPDATE files SET run = ? WHERE name = ?", reused_names)
+        cache.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", rows)
+
+    values = [stats for stats in results if stats is not None]
+    sketch.add(np.asarray(values, dtype=np.float64).reshape(-1, len(IMAGE_FEATURES)))
+
+    return len(pending), len(reused_names), len(results) - len(values)
+
+
+def _sketch_rows(split: str, sketch: ImageStatsSketch, unreadable: int) -> List[Tuple[str, str, object]]:
+    section = f"images_{split}"
+    rows: List[Tuple[str, str, object]] = [
+        (section, "images", sketch.total),
+        (section, "unreadable", unreadable),
+    ]
+
+    if sketch.total == 0:
+        return rows
+
+    for index, feature in enumerate(IMAGE_FEATURES):
+        rows.append((section, f"{feature}_mean", float(sketch.sums[index] / sketch.total)))
+        rows.append((section, f"{feature}_min", float(sketch.mins[index])))
+
+        for q in IMAGE_STATS_QUANTILES:
+            rows.append((section, f"{feature}_p{round(q * 100):02d}", sketch.quantile(index, q)))
+
+        rows.append((section, f"{feature}_max", float(sketch.maxs[index])))
+
+    return rows
+
+
+# CÁLCULO DAS ESTATÍSTICAS
+def compute_image_stats(
+    dataset_dir: Path = DATASET_DIR,
+    cache_dir: Path = IMAGE_STATS_CACHE_DIR,
+    sketch_path: Optional[Path] = None,
+    max_workers: Optional[int] = IMAGE_STATS_MAX_WORKERS,
+) -> List[Tuple[str, str, object]]:
+    """
+    Calcula as estatísticas de pixels de todas as imagens, por split.
+
+    Imagens com mesmo tamanho e mtime do cache não são decodificadas.
+    As demais são processadas em chunks de CHUNK_SIZE_FILES no pool,
+    e o cache é gravado ao final de cada chunk.
+    Se `sketch_path` for informado, os sketches são salvos em .npz.
+
+    Retorna linhas (section, metric, value) no mesmo formato
+    de compute_dataset_metrics():
+
+    ("images_train", "images", 1200)
+    ("images_train", "brightness_mean", 112.4)
+    ("images_train", "brightness_p05", 31.0)
+    ...
+    """
+
+    logger.info("Iniciando cálculo de estatísticas de pixels das imagens...")
+
+    metrics: List[Tuple[str, str, object]] = []
+    arrays: Dict[str, np.ndarray] = {}
+    decoded = 0
+    reused = 0
+    max_items = budget_items(MEMORY_BUDGET_SHARES["image_stats"])
+
+    try:
+        # spawn: o chamador pode ter threads ativas (ex.: relatórios de progresso, lote)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            for split in DATASET_SPLITS:
+                images_dir = dataset_dir / split / IMAGES_DIRNAME
+
+                if not images_dir.exists():
+                    logger.warning(f"Pasta de imagens não encontrada: {images_dir}")
+                    continue
+
+                cache, run = _open_cache(cache_dir / f"{split}.sqlite")
+                sketch = ImageStatsSketch()
+
+                names = sorted_dir_names(images_dir, max_items=max_items)
+                chunk: List[str] = []
+                counts = np.zeros(3, dtype=np.int64)
+
+                for name in names:
+                    chunk.append(name)
+
+                    if len(chunk) >= CHUNK_SIZE_FILES:
+                        counts += _process_chunk(pool, images_dir, chunk, cache, run, sketch)
+                        chunk = []
+
+                counts += _process_chunk(pool, images_dir, chunk, cache, run, sketch)
+                names.close()
+
+                split_decoded, split_reused, unreadable = (int(value) for value in counts)
+                decoded += split_decoded
+                reused += split_reused
+
+                _close_cache(cache, run)
+                metrics.extend(_sketch_rows(split, sketch, unreadable))
+                arrays.update(sketch.to_arrays(split))
+
+                logger.info(
+                    "Split %s | imagens: %d | ilegíveis: %d",
+                    split,
+                    sketch.total,
+                    unreadable,
+                )
+
+        if sketch_path is not None:
+            np.savez(
+                sketch_path,
+                features=np.asarray(IMAGE_FEATURES),
+                ranges=np.asarray([IMAGE_STATS_RANGES[feature] for feature in IMAGE_FEATURES]),
+                **arrays,
+            )
+            logger.info(f"Sketches de estatísticas de pixels salvos em: {sketch_path}")
+
+    except Exception as e:
+        logger.error("Erro ao calcular estatísticas de pixels:", exc_info=e)
+        raise
+
+    logger.info(
+        "Estatísticas de pixels concluídas | imagens decodificadas: %d | reaproveitadas do cache: %d",
+        decoded,
+        reused,
+    )
+
+    return metrics
@@ -6,7 +6,8 @@ para fins de Análise Exploratória de Dados (EDA).
 
 Este módulo:
 - considera apenas labels válidos
-- ignora labels vazios (imagens negativas)
+- ignora labels vazios (imagens negativas) nas métricas das boxes,
+  contando-os apenas como imagens com 0 boxes
 - ignora labels inválidos
 
 Gera métricas agregadas para posterior salvamento em CSV.
@@ -14,21 +15,63 @@ Gera métricas agregadas para posterior salvamento em CSV.
 
 import csv
 import logging
-from statistics import mean
-from typing import List, Set, Tuple
+import zlib
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
 
 from config.settings import (
+    ANCHOR_SAMPLE_SIZE,
     ARTIFACTS_METRICS_DIR, 
+    BOX_DENSITY_GRID,
+    BOX_HISTOGRAM_RANGES,
+    BOXES_PER_IMAGE_MAX,
+    CHUNK_SIZE_FILES,
+    COOCCURRENCE_MAX_CLASSES,
     DATASET_DIR,
     DATASET_METRICS_PATH, 
     DATASET_SPLITS, 
-    LABELS_DIRNAME
+    HISTOGRAM_BINS,
+    LABELS_DIRNAME,
+    MEMORY_BUDGET_SHARES
 ) 
+from core.dataset_loader import listing_fingerprint, sorted_dir_names
+from utils.checkpoint import Checkpoint
+from utils.progress import ProgressReporter
+from utils.spill import SortedRunSet, budget_items
 
 logger = logging.getLogger(__name__)
 
-# FUNÇÃO AUXILIAR
-def _classify_box(area: float) -> str:
+# Features geométricas acumuladas por box
+BOX_FEATURES = ("width", "height", "area", "proportion")
+
+# Listagens de labels mantidas simultaneamente (uma por split)
+_BUDGET_SHARE = MEMORY_BUDGET_SHARES["metrics"] / len(DATASET_SPLITS)
+
+# FUNÇÕES AUXILIARES
+def box_feature_histograms(w: np.ndarray, h: np.ndarray) -> np.ndarray:
+    """
+    Histogramas de bins fixos (BOX_HISTOGRAM_RANGES, HISTOGRAM_BINS)
+    das features das boxes, com shape (len(BOX_FEATURES), HISTOGRAM_BINS).
+
+    Compartilhado pelo scan de métricas e pelo drift entre versões
+    (dataset_diff.py), que assim usam os mesmos bins.
+    """
+
+    area = w * h
+    proportion = np.divide(w, h, out=np.zeros_like(w), where=h > 0)
+    histograms = np.zeros((len(BOX_FEATURES), HISTOGRAM_BINS), dtype=np.int64)
+
+    for index, (feature, values) in enumerate(zip(BOX_FEATURES, (w, h, area, proportion))):
+        low, high = BOX_HISTOGRAM_RANGES[feature]
+        histograms[index], _ = np.histogram(np.clip(values, low, high), bins=HISTOGRAM_BINS, range=(low, high))
+
+    return histograms
+
+
+def classify_box(area: float) -> str:
     """
     Classifica bounding box em small / medium / large
     baseado na área normalizada (YOLO-style).
@@ -42,13 +85,528 @@ def _classify_box(area: float) -> str:
     
     else:
         return "large"
-    
+
+
+# ACUMULADOR DE MÉTRICAS
+class MetricsAccumulator:
+    """
+    Estado parcial das métricas do dataset.
+
+    Mantém apenas contagem, soma, mínimo e máximo de cada feature
+    (memória constante).
+
+    Por split, mantém a distribuição de boxes por imagem e a matriz de
+    coocorrência de classes (imagens que contêm as classes a e b).
+    As imagens recebem ids inteiros dentro do chunk e os pares
+    (imagem, classe) são acumulados com bincount ao final de cada chunk:
+    custo linear no número de boxes, sem guardar nomes de arquivos.
+    A matriz é indexada pelas classes observadas (`cooccurrence_classes`,
+    ids ordenados), não pelo maior id: a memória é proporcional ao
+    número de classes distintas, limitado a COOCCURRENCE_MAX_CLASSES.
+
+    Mantém também uma amostra limitada de (w, h) para estimativa de
+    anchors: as ANCHOR_SAMPLE_SIZE boxes de menor prioridade, onde a
+    prioridade é um hash de (split, arquivo, linha). A amostra é
+    determinística e independe da ordem e do particionamento em chunks.
+
+    Mantém ainda histogramas de bins fixos (features das boxes e
+    densidade w x h), cujo tamanho independe do número de boxes;
+    são, com as boxes por imagem, a entrada dos plots de distribuição.
+
+    Acumuladores parciais (por chunk) são combinados com merge().
+    """
+
+    def __init__(self) -> None:
+        # feature -> [count, sum, min, max]
+        self.stats: Dict[str, List[float]] = {
+            feature: [0, 0.0, float("inf"), float("-inf")] for feature in BOX_FEATURES
+        }
+        self.classes: Set[float] = set()
+        self.box_sizes: Dict[str, int] = {"small": 0, "medium": 0, "large": 0}
+        self.total_boxes = 0
+        # colunas: prioridade, w, h
+        self.box_sample = np.empty((0, 3), dtype=np.float64)
+        self._sample_buffer: List[Tuple[int, float, float]] = []
+        # histogramas de bins fixos (BOX_HISTOGRAM_RANGES, BOX_DENSITY_GRID)
+        self.feature_hist = np.zeros((len(BOX_FEATURES), HISTOGRAM_BINS), dtype=np.int64)
+        self.wh_density = np.zeros((BOX_DENSITY_GRID, BOX_DENSITY_GRID), dtype=np.int64)
+        # por split (índice em DATASET_SPLITS)
+        self.boxes_per_image = np.zeros((len(DATASET_SPLITS), BOXES_PER_IMAGE_MAX + 1), dtype=np.int64)
+        self.split_boxes = np.zeros(len(DATASET_SPLITS), dtype=np.int64)
+        self.max_boxes_per_image = np.zeros(len(DATASET_SPLITS), dtype=np.int64)
+        # ids das classes (ordenados) -> linhas/colunas da matriz de coocorrência
+        self.cooccurrence_classes = np.empty(0, dtype=np.int64)
+        self.class_cooccurrence = np.zeros((len(DATASET_SPLITS), 0, 0), dtype=np.int64)
+        # buffers do chunk: uma entrada por imagem e uma por box
+        self._image_splits: List[int] = []
+        self._image_box_counts: List[int] = []
+        self._box_image_ids: List[int] = []
+        self._box_class_ids: List[int] = []
+
+    def add_image(self, split_index: int, box_count: int, class_ids: List[int]) -> None:
+        """
+        Registra um label: número de boxes válidas (0 = negativo)
+        e ids inteiros das classes dessas boxes.
+        """
+
+        image_id = len(self._image_splits)
+        self._image_splits.append(split_index)
+        self._image_box_counts.append(box_count)
+        self._box_image_ids.extend([image_id] * len(class_ids))
+        self._box_class_ids.extend(class_ids)
+
+    def _admit_classes(self, class_ids: np.ndarray) -> np.ndarray:
+        """
+        Inclui na matriz de coocorrência os ids ainda não vistos,
+        até COOCCURRENCE_MAX_CLASSES classes distintas.
+
+        Retorna os ids de `class_ids` (únicos, ordenados) presentes na matriz.
+        Ids recusados pelo limite são registrados no log e ignorados.
+        """
+
+        class_ids = np.unique(class_ids)
+        new_ids = np.setdiff1d(class_ids, self.cooccurrence_classes, assume_unique=True)
+
+        if len(new_ids) == 0:
+            return class_ids
+
+        room = COOCCURRENCE_MAX_CLASSES - len(self.cooccurrence_classes)
+
+        if len(new_ids) > room:
+            logger.warning(
+                f"Limite de {COOCCURRENCE_MAX_CLASSES} classes na coocorrência atingido; "
+                f"ignorando {len(new_ids) - max(room, 0)} ids de classe (ex.: {new_ids[max(room, 0)]})"
+            )
+            rejected = new_ids[max(room, 0):]
+            new_ids = new_ids[:max(room, 0)]
+            class_ids = np.setdiff1d(class_ids, rejected, assume_unique=True)
+
+            if len(new_ids) == 0:
+                return class_ids
+
+        classes = np.union1d(self.cooccurrence_classes, new_ids)
+        positions = np.searchsorted(classes, self.cooccurrence_classes)
+
+        grown = np.zeros((len(DATASET_SPLITS), len(classes), len(classes)), dtype=np.int64)
+        grown[:, positions[:, None], positions[None, :]] = self.class_cooccurrence
+
+        self.cooccurrence_classes = classes
+        self.class_cooccurrence = grown
+
+        return class_ids
+
+    def _flush_images(self) -> None:
+        """
+        Incorpora os buffers de imagens às contagens por split.
+
+        A coocorrência é um self-join vetorizado dos pares (imagem, classe)
+        distintos: cada par gera um par de classes com cada par da mesma
+        imagem, e os pares de classes são contados com um único bincount.
+        """
+
+        if not self._image_splits:
+            return
+
+        num_splits = len(DATASET_SPLITS)
+        width = BOXES_PER_IMAGE_MAX + 1
+
+        splits = np.asarray(self._image_splits, dtype=np.int64)
+        counts = np.asarray(self._image_box_counts, dtype=np.int64)
+
+        keys = splits * width + np.minimum(counts, BOXES_PER_IMAGE_MAX)
+        self.boxes_per_image += np.bincount(keys, minlength=num_splits * width).reshape(num_splits, width)
+        self.split_boxes += np.bincount(splits, weights=counts, minlength=num_splits).astype(np.int64)
+        np.maximum.at(self.max_boxes_per_image, splits, counts)
+
+        if self._box_class_ids:
+            class_ids = np.asarray(self._box_class_ids, dtype=np.int64)
+            image_ids = np.asarray(self._box_image_ids, dtype=np.int64)
+
+            admitted = self._admit_classes(class_ids)
+            num_classes = len(self.cooccurrence_classes)
+
+            if len(admitted) < len(np.unique(class_ids)):
+                kept = np.isin(class_ids, admitted)
+                class_ids = class_ids[kept]
+                image_ids = image_ids[kept]
+
+            # ids -> índices densos da matriz
+            class_ids = np.searchsorted(self.cooccurrence_classes, class_ids)
+
+            # Pares (imagem, classe) distintos, ordenados por imagem
+            pairs = np.unique(image_ids * num_classes + class_ids)
+            images = pairs // num_classes
+            classes = pairs % num_classes
+
+            group_sizes = np.bincount(images, minlength=len(splits))
+            group_starts = np.cumsum(group_sizes) - group_sizes
+            sizes = group_sizes[images]
+
+            left = np.repeat(np.arange(len(pairs)), sizes)
+            positions = np.arange(len(left)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            right = group_starts[images[left]] + positions
+
+            keys = (splits[images[left]] * num_classes + classes[left]) * num_classes + classes[right]
+            self.class_cooccurrence += np.bincount(
+                keys, minlength=num_splits * num_classes * num_classes
+            ).reshape(num_splits, num_classes, num_classes)
+
+        self._image_splits = []
+        self._image_box_counts = []
+        self._box_image_ids = []
+        self._box_class_ids = []
+
+    def add_box(self, cls: float, w: float, h: float, priority: int = 0) -> None:
+        area = w * h
+        proportion = w / h if h > 0 else 0.0
+
+        for feature, value in zip(BOX_FEATURES, (w, h, area, proportion)):
+            stat = self.stats[feature]
+            stat[0] += 1
+            stat[1] += value
+            stat[2] = min(stat[2], value)
+            stat[3] = max(stat[3], value)
+
+        self.classes.add(cls)
+        self.box_sizes[classify_box(area)] += 1
+        self.total_boxes += 1
+
+        self._sample_buffer.append((priority, w, h))
+
+        if len(self._sample_buffer) >= ANCHOR_SAMPLE_SIZE:
+            self._compact_sample()
+
+    def _compact_sample(self, extra: Optional[np.ndarray] = None) -> None:
+        """
+        Incorpora o buffer (e amostras extras) à amostra,
+        mantendo apenas as ANCHOR_SAMPLE_SIZE boxes de menor prioridade.
+        """
+
+        parts = [self.box_sample]
+
+        # Toda box passa pelo buffer exatamente uma vez: os histogramas
+        # são atualizados aqui, de forma vetorizada
+        if self._sample_buffer:
+            buffered = np.asarray(self._sample_buffer, dtype=np.float64)
+            self._bin_boxes(buffered[:, 1], buffered[:, 2])
+            parts.append(buffered)
+            self._sample_buffer = []
+
+        if extra is not None and len(extra):
+            parts.append(extra)
+
+        sample = np.concatenate(parts)
+
+        if len(sample) > ANCHOR_SAMPLE_SIZE:
+            keep = np.argsort(sample[:, 0], kind="stable")[:ANCHOR_SAMPLE_SIZE]
+            sample = sample[np.sort(keep)]
+
+        self.box_sample = sample
+
+    def _bin_boxes(self, w: np.ndarray, h: np.ndarray) -> None:
+        """
+        Acumula boxes (w, h) nos histogramas de bins fixos.
+        """
+
+        self.feature_hist += box_feature_histograms(w, h)
+
+        density, _, _ = np.histogram2d(
+            np.clip(w, 0.0, 1.0),
+            np.clip(h, 0.0, 1.0),
+            bins=BOX_DENSITY_GRID,
+            range=((0.0, 1.0), (0.0, 1.0)),
+        )
+        self.wh_density += density.astype(np.int64)
+
+    def sample_wh(self) -> np.ndarray:
+        """
+        Amostra de (w, h) das boxes, com shape (n, 2).
+        """
+
+        self._compact_sample()
+        return self.box_sample[:, 1:].copy()
+
+    def merge(self, other: "MetricsAccumulator") -> None:
+        for feature in BOX_FEATURES:
+            stat = self.stats[feature]
+            other_stat = other.stats[feature]
+            stat[0] += other_stat[0]
+            stat[1] += other_stat[1]
+            stat[2] = min(stat[2], other_stat[2])
+            stat[3] = max(stat[3], other_stat[3])
+
+        self.classes |= other.classes
+        self.total_boxes += other.total_boxes
+
+        for size, count in other.box_sizes.items():
+            self.box_sizes[size] += count
+
+        other._compact_sample()
+        self._compact_sample(other.box_sample)
+
+        self.feature_hist += other.feature_hist
+        self.wh_density += other.wh_density
+
+        other._flush_images()
+        self.boxes_per_image += other.boxes_per_image
+        self.split_boxes += other.split_boxes
+        np.maximum(self.max_boxes_per_image, other.max_boxes_per_image, out=self.max_boxes_per_image)
+
+        admitted = self._admit_classes(other.cooccurrence_classes)
+        positions = np.searchsorted(self.cooccurrence_classes, admitted)
+        other_positions = np.searchsorted(other.cooccurrence_classes, admitted)
+        self.class_cooccurrence[:, positions[:, None], positions[None, :]] += (
+            other.class_cooccurrence[:, other_positions[:, None], other_positions[None, :]]
+        )
+
+    @property
+    def images_with_objects(self) -> int:
+        """
+        Número de labels com ao menos uma box válida (todos os splits).
+        """
+
+        self._flush_images()
+        return int(self.boxes_per_image[:, 1:].sum())
+
+    def save_histograms(self, output_path: Path) -> None:
+        """
+        Salva os histogramas de bins fixos em .npz (entrada dos plots).
+        """
+
+        self._compact_sample()
+        self._flush_images()
+
+        np.savez(
+            output_path,
+            features=np.asarray(BOX_FEATURES),
+            feature_ranges=np.asarray([BOX_HISTOGRAM_RANGES[feature] for feature in BOX_FEATURES]),
+            feature_hist=self.feature_hist,
+            wh_density=self.wh_density,
+            splits=np.asarray(DATASET_SPLITS),
+            boxes_per_image=self.boxes_per_image,
+            cooccurrence_classes=self.cooccurrence_classes,
+            class_cooccurrence=self.class_cooccurrence,
+        )
+
+    def save_cooccurrence_csv(self, output_path: Path) -> None:
+        """
+        Salva a coocorrência de classes em CSV (formato longo).
+
+        Uma linha por split e par de classes (class_a <= class_b) com
+        ao menos uma imagem; a diagonal é o número de imagens com a classe.
+        """
+
+        self._flush_images()
+
+        with open(output_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["split", "class_a", "class_b", "images"])
+
+            for split_index, split in enumerate(DATASET_SPLITS):
+                matrix = self.class_cooccurrence[split_index]
+                class_a, class_b = np.nonzero(np.triu(matrix))
+
+                for a, b in zip(class_a.tolist(), class_b.tolist()):
+                    writer.writerow([
+                        split,
+                        int(self.cooccurrence_classes[a]),
+                        int(self.cooccurrence_classes[b]),
+                        int(matrix[a, b]),
+                    ])
+
+    def to_state(self) -> Dict[str, object]:
+        """
+        Estado serializável em JSON (usado nos checkpoints).
+        """
+
+        self._compact_sample()
+        self._flush_images()
+
+        return {
+            "stats": self.stats,
+            "classes": sorted(self.classes),
+            "box_sizes": self.box_sizes,
+            "total_boxes": self.total_boxes,
+            "box_sample": self.box_sample.tolist(),
+            "feature_hist": self.feature_hist.tolist(),
+            "wh_density": self.wh_density.tolist(),
+            "boxes_per_image": self.boxes_per_image.tolist(),
+            "split_boxes": self.split_boxes.tolist(),
+            "max_boxes_per_image": self.max_boxes_per_image.tolist(),
+            "cooccurrence_classes": self.cooccurrence_classes.tolist(),
+            "class_cooccurrence": self.class_cooccurrence.tolist(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object]) -> "MetricsAccumulator":
+        accumulator = cls()
+        accumulator.stats = {feature: list(stat) for feature, stat in state["stats"].items()}
+        accumulator.classes = set(state["classes"])
+        accumulator.box_sizes = dict(state["box_sizes"])
+        accumulator.total_boxes = state["total_boxes"]
+        accumulator.box_sample = np.asarray(state["box_sample"], dtype=np.float64).reshape(-1, 3)
+        accumulator.feature_hist = np.asarray(state["feature_hist"], dtype=np.int64)
+        accumulator.wh_density = np.asarray(state["wh_density"], dtype=np.int64)
+        accumulator.boxes_per_image = np.asarray(state["boxes_per_image"], dtype=np.int64)
+        accumulator.split_boxes = np.asarray(state["split_boxes"], dtype=np.int64)
+        accumulator.max_boxes_per_image = np.asarray(state["max_boxes_per_image"], dtype=np.int64)
+        accumulator.cooccurrence_classes = np.asarray(state["cooccurrence_classes"], dtype=np.int64)
+        num_classes = len(accumulator.cooccurrence_classes)
+        accumulator.class_cooccurrence = np.asarray(
+            state["class_cooccurrence"], dtype=np.int64
+        ).reshape(len(DATASET_SPLITS), num_classes, num_classes)
+        return accumulator
+
+
+def _process_chunk(
+    label_files: Iterable[Path],
+    split: str,
+    accumulator: MetricsAccumulator,
+    progress: ProgressReporter,
+) -> int:
+    """
+    Processa um chunk de arquivos de label de um split acumulando suas boxes válidas.
+
+    Retorna o número de arquivos processados.
+    """
+
+    processed = 0
+    split_index = DATASET_SPLITS.index(split)
+
+    for label_file in label_files:
+        processed += 1
+        progress.files_done += 1
+
+        try:
+            with open(label_file, "rb") as f:
+                data = f.read()
+
+            content = data.decode()
+            
+        except Exception as e:
+            logger.warning(f"Não foi possível ler o arquivo {label_file}: {e}")
+            continue
+
+        progress.bytes_done += len(data)
+        content = content.strip()
+            
+        # label vazio = negativo
+        if not content:
+            accumulator.add_image(split_index, 0, [])
+            continue  
+
+        # Chave estável do arquivo (split/nome) para a prioridade da amostra de boxes
+        file_key = f"{split}/{label_file.name}"
+        box_count = 0
+        class_ids: List[int] = []
+
+        for line_index, line in enumerate(content.splitlines()):
+            parts = line.split()
+                
+            # label inválido   
+            if len(parts) != 5:
+                logger.warning(f"Label mal formatado em {label_file}: {line}")
+                continue  
+
+            try:
+                cls, _,_, w, h = parts
+                w = float(w)
+                h = float(h)
+            
+            except ValueError as exc:
+                logger.warning(f"Erro ao converter valores numéricos em {label_file}: {exc}")
+                continue  # label inválido
+
+            priority = zlib.crc32(f"{file_key}#{line_index}".encode())
+            cls = float(cls)
+            accumulator.add_box(cls, w, h, priority)
+            box_count += 1
+
+            # Coocorrência: apenas classes inteiras não negativas
+            if cls >= 0 and cls.is_integer():
+                class_ids.append(int(cls))
+            else:
+                logger.warning(f"Classe não inteira ignorada na coocorrência em {label_file}: {cls}")
+
+        accumulator.add_image(split_index, box_count, class_ids)
+
+    return processed
+
+
+def _metrics_rows(accumulator: MetricsAccumulator) -> List[Tuple[str, str, object]]:
+    """
+    Converte o acumulador final em linhas (section, metric, value).
+    """
+
+    metrics: List[Tuple[str, str, object]] = [
+        ("labels", "images_with_objects", accumulator.images_with_objects),
+        ("labels", "total_boxes", accumulator.total_boxes),
+        ("labels", "classes", sorted(accumulator.classes)),
+    ]
+
+    for feature in BOX_FEATURES:
+        count, total, minimum, maximum = accumulator.stats[feature]
+        metrics.extend([
+            ("boxes", f"{feature}_mean", total / count),
+            ("boxes", f"{feature}_min", minimum),
+            ("boxes", f"{feature}_max", maximum),
+        ])
+
+    for size, count in accumulator.box_sizes.items():
+        metrics.append(("box_sizes", size, count))
+
+    for split_index, split in enumerate(DATASET_SPLITS):
+        images = int(accumulator.boxes_per_image[split_index].sum())
+
+        if images == 0:
+            continue
+
+        split_boxes = int(accumulator.split_boxes[split_index])
+        metrics.extend([
+            (f"labels_{split}", "labeled_images", images),
+            (f"labels_{split}", "images_with_objects", int(accumulator.boxes_per_image[split_index, 1:].sum())),
+            (f"labels_{split}", "total_boxes", split_boxes),
+            (f"labels_{split}", "boxes_per_image_mean", split_boxes / images),
+            (f"labels_{split}", "boxes_per_image_max", int(accumulator.max_boxes_per_image[split_index])),
+        ])
+
+    return metrics
+
 
 # CALCULO DE MÉTRICAS
-def compute_dataset_metrics() -> List[Tuple[str, str, object]]:
+def compute_dataset_metrics(
+    dataset_dir: Path = DATASET_DIR,
+    checkpoint: Optional[Checkpoint] = None,
+    box_sample_path: Optional[Path] = None,
+    histograms_path: Optional[Path] = None,
+    cooccurrence_path: Optional[Path] = None,
+) -> List[Tuple[str, str, object]]:
     """
     Calcula métricas exploratórias do dataset.
 
+    Por padrão considera o dataset configurado em DATASET_DIR.
+
+    Os arquivos são processados em ordem determinística e em chunks
+    de CHUNK_SIZE_FILES; cada chunk gera um acumulador parcial que é
+    combinado ao total.
+
+    Se `checkpoint` for informado, os offsets por split e o estado do
+    acumulador são gravados periodicamente ao final dos chunks, e uma
+    nova execução retoma do último checkpoint com o mesmo resultado final.
+
+    O progresso da leitura dos labels (arquivos, taxas, ETA) é
+    reportado a cada PROGRESS_INTERVAL_S (ver utils/progress.py).
+
+    Se `box_sample_path` for informado, a amostra limitada de (w, h)
+    das boxes é salva em .npy (entrada da estimativa de anchors).
+
+    Se `histograms_path` for informado, os histogramas de bins fixos
+    (features, densidade w x h, boxes por imagem e coocorrência de
+    classes por split) são salvos em .npz.
+
+    Se `cooccurrence_path` for informado, a coocorrência de classes
+    por split é salva em CSV.
+
     Retorna uma lista de tuplas no formato:
     (section, metric, value)
 
@@ -57,112 +615,104 @@ def compute_dataset_metrics() -> List[Tuple[str, str, object]]:
 
     logger.info("Iniciando cálculo de métricas do dataset...")
 
-    # Inicialização dos acumuladores
-    widths: List[float] = []
-    heights: List[float] = []
-    areas: List[float] = []
-    proportions: List[float] = []
-    classes: Set[float] = set()
-
-    # contador de tamanhos
-    box_sizes = {
-        "small": 0,
-        "medium": 0,
-        "large": 0
-    }
-
-    images_with_objects: Set[str] = set()
-    total_boxes = 0
+    accumulator = MetricsAccumulator()
+    progress = ProgressReporter("metrics", 0, dataset_dir)
     
     try:
-        # Percorre cada split definido no settings
+        # Listagem ordenada dos labels: define offsets estáveis para o checkpoint
+        label_names: Dict[str, SortedRunSet] = {}
+        max_items = budget_items(_BUDGET_SHARE)
+
         for split in DATASET_SPLITS:
-            labels_dir = DATASET_DIR / split / LABELS_DIRNAME
+            labels_dir = dataset_dir / split / LABELS_DIRNAME
 
             if not labels_dir.exists():
                 logger.warning(f"Pasta de labels não encontrada: {labels_dir}")
                 continue
 
-            for label_file in labels_dir.glob("*.txt"):
-                try:
-                    with open(label_file, "r") as f:
-                        content = f.read().strip()
-                    
-                except Exception as e:
-                    logger.warning(f"Não foi possível ler o arquivo {label_file}: {e}")
-                    continue
-                    
-                # label vazio = negativo
-                if not content:
-                    continue  
-                        
-                images_with_objects.add(label_file.stem)
-
-                for line in content.splitlines():
-                    parts = line.split()
-                        
-                    # label inválido   
-                    if len(parts) != 5:
-                        logger.warning(f"Label mal formatado em {label_file}: {line}")
-                        continue  
-
-                    try:
-                        cls, _,_, w, h = parts
-                        w = float(w)
-                        h = float(h)
-                    
-                    except ValueError as exc:
-                        logger.warning(f"Erro ao converter valores numéricos em {label_file}: {exc}")
-                        continue  # label inválido
+            label_names[split] = sorted_dir_names(labels_dir, ".txt", max_items=max_items)
 
-                    area = w * h
-                    proportion = w / h if h > 0 else 0.0
+        offsets: Dict[str, int] = {split: 0 for split in label_names}
 
-                    widths.append(w)
-                    heights.append(h)
-                    areas.append(area)
-                    proportions.append(proportion)
-                    classes.add(float(cls))
+        if checkpoint is not None:
+            state = checkpoint.load({
+                "label_files": {split: len(names) for split, names in label_names.items()},
+                "label_listing": {
+                    split: listing_fingerprint(dataset_dir / split / LABELS_DIRNAME, names)
+                    for split, names in label_names.items()
+                },
+            })
 
-                    box_sizes[_classify_box(area)] += 1
-                    total_boxes += 1
+            if state is not None:
+                accumulator = MetricsAccumulator.from_state(state["accumulator"])
+                offsets = state["offsets"]
+
+        progress.files_total = sum(len(names) for names in label_names.values())
+        progress.start(sum(offsets.values()))
+
+        # Percorre cada split definido no settings
+        for split, names in label_names.items():
+            labels_dir = dataset_dir / split / LABELS_DIRNAME
+            label_files = (labels_dir / name for name in islice(names, offsets[split], None))
+
+            if offsets[split]:
+                logger.info(f"Split {split} | retomando a partir do label {offsets[split]}")
+
+            while True:
+                chunk = MetricsAccumulator()
+                processed = _process_chunk(islice(label_files, CHUNK_SIZE_FILES), split, chunk, progress)
+
+                if processed == 0:
+                    break
+
+                offsets[split] += processed
+                accumulator.merge(chunk)
+
+                if checkpoint is not None and checkpoint.due():
+                    checkpoint.save({
+                        "offsets": offsets,
+                        "accumulator": accumulator.to_state(),
+                    })
+
+            names.close()
+
+        if checkpoint is not None:
+            checkpoint.save(
+                {
+                    "offsets": offsets,
+                    "accumulator": accumulator.to_state(),
+                },
+                force=True,
+            )
+
+        if box_sample_path is not None:
+            np.save(box_sample_path, accumulator.sample_wh())
+            logger.info(f"Amostra de boxes (w, h) salva em: {box_sample_path}")
+
+        if histograms_path is not None:
+            accumulator.save_histograms(histograms_path)
+            logger.info(f"Histogramas das boxes salvos em: {histograms_path}")
+
+        if cooccurrence_path is not None:
+            accumulator.save_cooccurrence_csv(cooccurrence_path)
+            logger.info(f"Coocorrência de classes salva em: {cooccurrence_path}")
     
     except Exception as e:
+        progress.stop(failed=True)
         logger.error("Erro ao calcular métricas do dataset:", exc_info=e)
         raise
+
+    progress.stop()
     
     
     metrics: List[Tuple[str, str, object]] = []
 
-    if total_boxes == 0:
+    if accumulator.total_boxes == 0:
         logger.error("Nenhuma bounding box válida encontrada no dataset.")
         return metrics
     
     try:
-        metrics.extend([
-            ("labels", "images_with_objects", len(images_with_objects)),
-            ("labels", "total_boxes", total_boxes),
-            ("labels", "classes", sorted(classes)),
-
-            ("boxes", "width_mean", mean(widths)),
-            ("boxes", "width_min", min(widths)),
-            ("boxes", "width_max", max(widths)),
-
-            ("boxes", "height_mean", mean(heights)),
-            ("boxes", "height_min", min(heights)),
-            ("boxes", "height_max", max(heights)),
-
-            ("boxes", "area_mean", mean(areas)),
-            ("boxes", "area_min", min(areas)),
-            ("boxes", "area_max", max(areas)),
-
-            ("boxes", "proportion_mean", mean(proportions)),
-            ("boxes", "proportion_min", min(proportions)),
-            ("boxes", "proportion_max", max(proportions)),
-        ])
-
-        for size, count in box_sizes.items():
-            metrics.append(("box_sizes", size, count))
+        metrics = _metrics_rows(accumulator)
 
     except Exception as e:
         logger.error("Erro ao calcular estatísticas do dataset:", exc_info=e)
@@ -171,13 +721,15 @@ def compute_dataset_metrics() -> List[Tuple[str, str, object]]:
     logger.info("Cálculo de métricas do dataset concluído.")
     return metrics
 
-def save_metrics_csv(metrics: List[Tuple[str, str, object]]) -> None:
+def save_metrics_csv(
+    metrics: List[Tuple[str, str, object]],
+    output_path: Path = DATASET_METRICS_PATH,
+) -> None:
     """
-    Salva métricas em CSV dentro de artifacts/metrics.
+    Salva métricas em CSV (por padrão dentro de artifacts/metrics).
 
     Assume que o diretório já existe.
     """
-    output_path = DATASET_METRICS_PATH
 
     try:
         with open(output_path, "w", newline="") as csv_file:
@@ -0,0 +1,277 @@
+"""
+pipeline.py
+
+Responsável por executar o EDA como um DAG de etapas
+com cache endereçado por conteúdo.
+
+Cada etapa declara:
+- as etapas das quais depende (inputs)
+- os arquivos que produz (outputs)
+- os parâmetros que influenciam seu resultado (settings)
+- se lê o dataset diretamente
+
+A chave de cache de uma etapa é o hash de: nome, versão do cache,
+settings, fingerprint do dataset (quando lê o dataset) e hashes dos
+outputs das etapas de entrada. Etapas com a mesma chave e outputs
+intactos são puladas; etapas independentes executam em paralelo.
+
+Etapas que leem o dataset (validação, métricas, ...) são parsers em
+Python puro, limitados por CPU: executam em um pool de processos, já que
+em threads seriam serializadas pelo GIL. As demais (leves, sobre os
+artifacts) executam na thread principal, enquanto os processos seguem
+em paralelo; assim os plots (pyplot) nunca rodam fora da thread principal.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.settings import (
+    DATASET_DIR,
+    PIPELINE_CACHE_VERSION,
+    PIPELINE_MAX_WORKERS,
+    STAGE_MANIFEST_PATH
+)
+from core.dataset_state import dataset_fingerprint
+from utils.logging_global import setup_logging
+
+logger = logging.getLogger(__name__)
+
+Manifest = Dict[str, Dict[str, object]]
+
+
+@dataclass
+class Stage:
+    """
+    Etapa do pipeline.
+
+    `run` não recebe argumentos: as etapas se comunicam
+    apenas pelos arquivos declarados em `outputs`.
+
+    Etapas com `reads_dataset` executam em outro processo:
+    `run` deve ser uma função de módulo (serializável com pickle).
+    """
+
+    name: str
+    run: Callable[[], None]
+    outputs: Tuple[Path, ...]
+    inputs: Tuple[str, ...] = ()
+    settings: Dict[str, object] = field(default_factory=dict)
+    reads_dataset: bool = False
+
+
+# FUNÇÕES AUXILIARES
+def _hash_file(path: Path) -> str:
+    """
+    sha256 do conteúdo de um arquivo, lido em blocos.
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _stage_key(stage: Stage, manifest: Manifest, dataset_hash: Optional[str]) -> str:
+    """
+    Chave de cache da etapa a partir de tudo que influencia seu resultado.
+    """
+
+    payload = {
+        "stage": stage.name,
+        "version": PIPELINE_CACHE_VERSION,
+        "settings": stage.settings,
+        "dataset": dataset_hash if stage.reads_dataset else None,
+        "inputs": {dep: manifest[dep]["outputs"] for dep in stage.inputs},
+    }
+
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _is_cached(stage: Stage, key: str, manifest: Manifest) -> bool:
+    """
+    A etapa está em cache se a chave coincide e os outputs
+    existem com o mesmo conteúdo registrado no manifesto.
+    """
+
+    entry = manifest.get(stage.name)
+
+    if entry is None or entry.get("key") != key:
+        return False
+
+    for output in stage.outputs:
+        recorded = entry["outputs"].get(str(output))
+
+        if recorded is None or not output.exists() or _hash_file(output) != recorded:
+            return False
+
+    return True
+
+
+def _load_manifest(path: Path) -> Manifest:
+    if not path.exists():
+        return {}
+
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+
+    except Exception as e:
+        logger.warning(f"Manifesto de cache ilegível, ignorando {path}: {e}")
+        return {}
+
+
+def _save_manifest(manifest: Manifest, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".json.tmp")
+
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    os.replace(tmp_path, path)
+
+
+def _run_inline(stage: Stage) -> Future:
+    """
+    Executa a etapa na thread atual e retorna um Future já concluído.
+    """
+
+    future: Future = Future()
+
+    try:
+        stage.run()
+
+    except Exception as e:
+        future.set_exception(e)
+
+    else:
+        future.set_result(None)
+
+    return future
+
+
+# EXECUÇÃO DO DAG
+def run_stages(
+    stages: List[Stage],
+    dataset_dir: Path = DATASET_DIR,
+    manifest_path: Path = STAGE_MANIFEST_PATH,
+    force: bool = False,
+    max_workers: Optional[int] = PIPELINE_MAX_WORKERS,
+) -> Dict[str, str]:
+    """
+    Executa as etapas respeitando as dependências.
+
+    Etapas prontas (dependências concluídas) são avaliadas contra o
+    cache; as que leem o dataset são submetidas a um pool de processos
+    e as demais executam na thread principal, de modo que etapas
+    independentes executam em paralelo.
+    Com `force`, o cache é ignorado.
+
+    Retorna {etapa: "cached" | "executed"}.
+    """
+
+    by_name = {stage.name: stage for stage in stages}
+
+    for stage in stages:
+        missing = [dep for dep in stage.inputs if dep not in by_name]
+
+        if missing:
+            logger.error(f"Etapa {stage.name} depende de etapas inexistentes: {missing}")
+            raise ValueError(f"Dependências inexistentes para a etapa {stage.name}")
+
+    manifest = _load_manifest(manifest_path)
+
+    dataset_hash = None
+
+    if any(stage.reads_dataset for stage in stages):
+        logger.info("Calculando fingerprint do dataset")
+        dataset_hash = dataset_fingerprint(dataset_dir)
+
+    pending = dict(by_name)
+    status: Dict[str, str] = {}
+    running: Dict[Future, Tuple[Stage, str]] = {}
+    failures: List[BaseException] = []
+
+    # Processos criados sob demanda (spawn: o processo principal pode ter threads ativas)
+    process_pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_logging,
+    )
+
+    with process_pool:
+        while pending or running:
+            # Avalia todas as etapas prontas; etapas em cache podem liberar outras
+            progressed = True
+            inline: List[Tuple[Stage, str]] = []
+
+            while progressed and not failures:
+                progressed = False
+
+                for name, stage in list(pending.items()):
+                    if not all(status.get(dep) for dep in stage.inputs):
+                        continue
+
+                    del pending[name]
+                    progressed = True
+                    key = _stage_key(stage, manifest, dataset_hash)
+
+                    if not force and _is_cached(stage, key, manifest):
+                        logger.info(f"Etapa {name}: inalterada, usando resultado em cache")
+                        status[name] = "cached"
+                        continue
+
+                    logger.info(f"Etapa {name}: executando")
+
+                    if stage.reads_dataset:
+                        running[process_pool.submit(stage.run)] = (stage, key)
+                    else:
+                        inline.append((stage, key))
+
+            # Etapas leves executam após submeter as etapas em processos
+            for stage, key in inline:
+                running[_run_inline(stage)] = (stage, key)
+
+            if not running:
+                if pending and not failures:
+                    logger.error(f"Dependências cíclicas entre as etapas: {sorted(pending)}")
+                    raise ValueError("O pipeline contém dependências cíclicas")
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in finished:
+                stage, key = running.pop(future)
+
+                try:
+                    future.result()
+
+                except Exception as e:
+                    logger.error(f"Falha na etapa {stage.name}:", exc_info=e)
+                    failures.append(e)
+                    continue
+
+                # O manifesto é atualizado apenas nesta thread
+                manifest[stage.name] = {
+                    "key": key,
+                    "outputs": {str(output): _hash_file(output) for output in stage.outputs},
+                }
+                _save_manifest(manifest, manifest_path)
+
+                status[stage.name] = "executed"
+                logger.info(f"Etapa {stage.name}: concluída")
+
+    if failures:
+        raise failures[0]
+
+    return status
@@ -0,0 +1,258 @@
+"""
+sqlite_index.py
+
+Responsável por gerar um índice SQLite consultável do dataset,
+com uma linha por arquivo de label, por box e por problema de validação.
+
+Tabelas:
+- files:  id, split, name, status, box_count
+- boxes:  id, file_id, split, class_id, x, y, w, h, area, proportion, size_bucket
+- issues: id, split, issue, file
+
+A carga usa executemany em lotes de SQLITE_BATCH_SIZE linhas, cada lote
+em uma transação, com journal em WAL. Os índices (split, classe,
+tamanho) são criados após a carga. O arquivo é gerado em um caminho
+temporário e só substitui o índice anterior ao final.
+
+Status dos arquivos: como em validator.py, labels vazios são "empty"
+e linhas sem exatamente 5 valores tornam o arquivo "malformed"; além
+disso, aqui valores não numéricos ou não finitos (nan, inf) também
+tornam o arquivo "malformed" e a linha é descartada (não há box sem
+coordenadas no índice). As boxes seguem metrics.py.
+"""
+
+import csv
+import logging
+import math
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Tuple
+
+from config.settings import (
+    DATASET_DIR,
+    DATASET_SPLITS,
+    LABELS_DIRNAME,
+    MEMORY_BUDGET_SHARES,
+    SQLITE_BATCH_SIZE,
+    SQLITE_INDEX_PATH,
+    VALIDATION_REPORT_PATH
+)
+from core.dataset_loader import sorted_dir_names
+from core.metrics import classify_box
+from utils.spill import budget_items
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE files (
+    id INTEGER PRIMARY KEY,
+    split TEXT NOT NULL,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    box_count INTEGER NOT NULL
+);
+
+CREATE TABLE boxes (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    split TEXT NOT NULL,
+    class_id REAL NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    w REAL NOT NULL,
+    h REAL NOT NULL,
+    area REAL NOT NULL,
+    proportion REAL NOT NULL,
+    size_bucket TEXT NOT NULL
+);
+
+CREATE TABLE issues (
+    id INTEGER PRIMARY KEY,
+    split TEXT NOT NULL,
+    issue TEXT NOT NULL,
+    file TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX idx_files_split ON files(split);
+CREATE INDEX idx_boxes_split ON boxes(split);
+CREATE INDEX idx_boxes_class ON boxes(class_id);
+CREATE INDEX idx_boxes_size_bucket ON boxes(size_bucket);
+CREATE INDEX idx_boxes_file ON boxes(file_id);
+CREATE INDEX idx_issues_split_issue ON issues(split, issue);
+"""
+
+FileRow = Tuple[int, str, str, str, int]
+BoxRow = Tuple[int, str, float, float, float, float, float, float, float, str]
+
+
+# FUNÇÕES AUXILIARES
+def _parse_label_file(label_file: Path) -> Tuple[str, List[Tuple[float, ...]]]:
+    """
+    Lê um label e retorna (status, boxes válidas).
+
+    status: ok | unreadable | empty | malformed
+    boxes: (class_id, x, y, w, h), apenas linhas com 5 valores finitos
+    """
+
+    try:
+        with open(label_file, "r") as f:
+            content = f.read().strip()
+
+    except Exception as e:
+        logger.warning(f"Não foi possível ler o arquivo {label_file}: {e}")
+        return "unreadable", []
+
+    if not content:
+        return "empty", []
+
+    status = "ok"
+    boxes: List[Tuple[float, ...]] = []
+
+    for line in content.splitlines():
+        parts = line.split()
+
+        if len(parts) != 5:
+            status = "malformed"
+            continue
+
+        try:
+            values = tuple(float(part) for part in parts)
+
+        except ValueError:
+            status = "malformed"
+            continue
+
+        # nan/inf seriam gravados como NULL pelo sqlite3
+        if not all(math.isfinite(value) for value in values):
+            status = "malformed"
+            continue
+
+        boxes.append(values)
+
+    return status, boxes
+
+
+def _flush(connection: sqlite3.Connection, files: List[FileRow], boxes: List[BoxRow]) -> None:
+    """
+    Insere um lote de arquivos e boxes em uma única transação.
+    """
+
+    with connection:
+        connection.executemany("INSERT INTO files VALUES (?, ?, ?, ?, ?)", files)
+        connection.executemany(
+            "INSERT INTO boxes (file_id, split, class_id, x, y, w, h, area, proportion, size_bucket) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            boxes,
+        )
+
+    files.clear()
+    boxes.clear()
+
+
+def _load_issues(connection: sqlite3.Connection, validation_report_path: Path) -> int:
+    """
+    Carrega o relatório de validação (CSV) na tabela issues.
+    """
+
+    if not validation_report_path.exists():
+        logger.warning(f"Relatório de validação não encontrado: {validation_report_path}")
+        return 0
+
+    total = 0
+    batch: List[Tuple[str, str, str]] = []
+
+    with open(validation_report_path, "r", newline="") as csv_file:
+        for row in csv.DictReader(csv_file):
+            batch.append((row["split"], row["issue"], row["file"]))
+
+            if len(batch) >= SQLITE_BATCH_SIZE:
+                with connection:
+                    connection.executemany("INSERT INTO issues (split, issue, file) VALUES (?, ?, ?)", batch)
+                total += len(batch)
+                batch = []
+
+    with connection:
+        connection.executemany("INSERT INTO issues (split, issue, file) VALUES (?, ?, ?)", batch)
+
+    return total + len(batch)
+
+
+# GERAÇÃO DO ÍNDICE
+def build_sqlite_index(
+    dataset_dir: Path = DATASET_DIR,
+    validation_report_path: Path = VALIDATION_REPORT_PATH,
+    output_path: Path = SQLITE_INDEX_PATH,
+) -> None:
+    """
+    Gera o índice SQLite do dataset em output_path.
+
+    Assume que o diretório de destino já existe.
+    """
+
+    logger.info("Iniciando geração do índice SQLite do dataset...")
+
+    tmp_path = output_path.with_suffix(".sqlite.tmp")
+
+    for path in (tmp_path, Path(f"{tmp_path}-wal"), Path(f"{tmp_path}-shm")):
+        path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp_path)
+
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+
+        file_id = 0
+        total_boxes = 0
+        files: List[FileRow] = []
+        boxes: List[BoxRow] = []
+        max_items = budget_items(MEMORY_BUDGET_SHARES["sqlite_index"])
+
+        for split in DATASET_SPLITS:
+            labels_dir = dataset_dir / split / LABELS_DIRNAME
+            names = sorted_dir_names(labels_dir, ".txt", max_items=max_items)
+
+            for name in names:
+                file_id += 1
+                status, label_boxes = _parse_label_file(labels_dir / name)
+                files.append((file_id, split, name, status, len(label_boxes)))
+
+                for cls, x, y, w, h in label_boxes:
+                    area = w * h
+                    proportion = w / h if h > 0 else 0.0
+                    boxes.append((file_id, split, cls, x, y, w, h, area, proportion, classify_box(area)))
+
+                total_boxes += len(label_boxes)
+
+                if len(files) + len(boxes) >= SQLITE_BATCH_SIZE:
+                    _flush(connection, files, boxes)
+
+            names.close()
+            logger.info(f"Split {split} indexado | arquivos acumulados: {file_id} | boxes: {total_boxes}")
+
+        _flush(connection, files, boxes)
+        total_issues = _load_issues(connection, validation_report_path)
+
+        logger.info("Criando índices do SQLite (split, classe, tamanho)")
+        connection.executescript(INDEXES)
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        connection.close()
+
+        os.replace(tmp_path, output_path)
+
+    except Exception as e:
+        connection.close()
+        logger.error("Erro ao gerar índice SQLite do dataset:", exc_info=e)
+        raise
+
+    logger.info(
+        "Índice SQLite salvo em: %s | arquivos: %d | boxes: %d | problemas: %d",
+        output_path,
+        file_id,
+        total_boxes,
+        total_issues,
+    )
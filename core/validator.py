@@ -12,22 +12,77 @@ Este módulo identifica problemas estruturais como:
 Não interpreta semântica das bounding boxes.
 """
 
+import csv
 import logging
-from typing import Dict, List, Set
+from itertools import islice
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from config.settings import (
+    CHUNK_SIZE_FILES,
     DATASET_DIR, 
     DATASET_SPLITS, 
     IMAGES_DIRNAME, 
-    LABELS_DIRNAME
+    LABELS_DIRNAME,
+    MEMORY_BUDGET_SHARES,
+    VALIDATION_REPORT_PATH
 )
+from core.dataset_loader import iter_dir_names, listing_fingerprint, sorted_dir_names
+from utils.checkpoint import Checkpoint
+from utils.progress import ProgressReporter
+from utils.spill import SortedRunSet, SpillList, budget_items, sorted_difference
 
 logger = logging.getLogger(__name__)
 
-def validate_dataset() -> Dict[str, Dict[str, List[str]]]:
+# Estruturas simultâneas em memória (nomes de labels por split,
+# 2 conjuntos de nomes base + 3 listas de problemas do split atual;
+# as listas dos splits concluídos são descarregadas por completo em disco)
+_BUDGET_SHARE = MEMORY_BUDGET_SHARES["validation"] / (len(DATASET_SPLITS) + 5)
+
+
+def _is_invalid_label(label_file: Path, progress: ProgressReporter) -> bool:
+    """
+    Verifica se um arquivo de label é ilegível, vazio ou mal formatado.
+    """
+
+    try:
+        with open(label_file, "rb") as f:
+            data = f.read()
+
+        content = data.decode()
+    
+    except Exception as e:
+        logger.error(f"Erro ao ler label {label_file}: {e}")
+        return True
+
+    progress.bytes_done += len(data)
+    content = content.strip()
+
+    # ERRO: arquivo de label vazio
+    if not content:
+        logger.warning(f"Label vazio: {label_file}")
+        return True
+
+    # Cada linha deve conter exatamente 5 valores padrão YOLO
+    for line in content.splitlines():
+        parts = line.split()
+
+        if len(parts) != 5:
+            logger.warning(f"Label mal formatada em {label_file}: {line}")
+            return True
+
+    return False
+
+
+def validate_dataset(
+    dataset_dir: Path = DATASET_DIR,
+    checkpoint: Optional[Checkpoint] = None,
+) -> Dict[str, Dict[str, SpillList]]:
     """
     Valida a consistência do dataset por split.
 
+    Por padrão valida o dataset configurado em DATASET_DIR.
+
     Retorna um dicionário no formato:
 
     {
@@ -37,66 +92,111 @@ def validate_dataset() -> Dict[str, Dict[str, List[str]]]:
             "invalid_labels": [...]
         }
     }
+
+    As listas são SpillList: suportam len() e iteração, e respeitam
+    MEMORY_BUDGET_MB descarregando itens em disco quando necessário.
+
+    Se `checkpoint` for informado, o progresso da leitura dos labels
+    é gravado periodicamente e retomado em uma nova execução.
+
+    O progresso da leitura dos labels (arquivos, taxas, ETA) é
+    reportado a cada PROGRESS_INTERVAL_S (ver utils/progress.py).
     """
 
     logger.info("Iniciando validação do dataset...")
-    validation_report: Dict[str, Dict[str, List[str]]] = {}
+    validation_report: Dict[str, Dict[str, SpillList]] = {}
+    max_items = budget_items(_BUDGET_SHARE)
+    progress = ProgressReporter("validation", 0, dataset_dir)
 
     try:
+        # Listagem ordenada dos labels: define offsets estáveis para o checkpoint
+        label_names: Dict[str, SortedRunSet] = {
+            split: sorted_dir_names(dataset_dir / split / LABELS_DIRNAME, max_items=max_items)
+            for split in DATASET_SPLITS
+        }
+
+        state: Dict[str, Dict[str, int]] = {}
+
+        if checkpoint is not None:
+            state = checkpoint.load({
+                "label_files": {split: len(names) for split, names in label_names.items()},
+                "label_listing": {
+                    split: listing_fingerprint(dataset_dir / split / LABELS_DIRNAME, names)
+                    for split, names in label_names.items()
+                },
+            }) or {}
+
+        # Apenas os .txt são lidos: o total usa o mesmo filtro da varredura
+        progress.files_total = sum(
+            1 for names in label_names.values() for name in names if name.endswith(".txt")
+        )
+        progress.start(sum(split_state["offset"] for split_state in state.values()))
+
         # Percorre cada split definido no settings
         for split in DATASET_SPLITS:
             logger.info(f"Validando split: {split}")
             
-            images_dir = DATASET_DIR / split / IMAGES_DIRNAME
-            labels_dir = DATASET_DIR / split / LABELS_DIRNAME
-
-            # Coleta nomes base
-            images: Set[str] = (
-                {img.stem for img in images_dir.glob("*")} 
-                if images_dir.exists() 
-                else set()
-            )
-            labels: Set[str] = (
-                {lbl.stem for lbl in labels_dir.glob("*")} 
-                if labels_dir.exists() 
-                else set()
-            )
+            images_dir = dataset_dir / split / IMAGES_DIRNAME
+            labels_dir = dataset_dir / split / LABELS_DIRNAME
+
+            # Coleta nomes base (ordenados em runs no disco se exceder o limite)
+            images = SortedRunSet(max_items)
+            labels = SortedRunSet(max_items)
+            invalid_labels = SpillList(max_items)
+
+            images.update(Path(name).stem for name in iter_dir_names(images_dir))
+            labels.update(Path(name).stem for name in label_names[split])
+
+            split_state = state.get(split, {"offset": 0, "log_size": 0})
+            offset = split_state["offset"]
+
+            if checkpoint is not None and offset:
+                invalid_labels.extend(checkpoint.read_log(split, split_state["log_size"]))
+                logger.info(f"Split {split} | retomando a partir do label {offset}")
+
+            # Validação básica do conteúdo dos arquivos de label (.txt)
+            txt_names = (name for name in label_names[split] if name.endswith(".txt"))
+            pending: List[str] = []
+
+            for index, name in enumerate(islice(txt_names, offset, None), start=offset + 1):
+                progress.files_done += 1
+
+                if _is_invalid_label(labels_dir / name, progress):
+                    invalid_labels.append(name)
+                    pending.append(name)
+
+                if checkpoint is not None and index % CHUNK_SIZE_FILES == 0:
+                    split_state = {"offset": index, "log_size": checkpoint.append_log(split, pending)}
+                    state[split] = split_state
+                    pending = []
+                    checkpoint.save(state)
+
+                offset = index
+
+            if checkpoint is not None:
+                state[split] = {"offset": offset, "log_size": checkpoint.append_log(split, pending)}
+                checkpoint.save(state, force=True)
 
             # ERRO: label existe, mas imagem não
-            labels_without_images = sorted(labels - images)
+            labels_without_images = SpillList(max_items)
+            labels_without_images.extend(sorted_difference(labels, images))
 
             # IMAGENS NEGATIVAS: imagem existe, mas label não
-            images_without_labels = sorted(images - labels)
+            images_without_labels = SpillList(max_items)
+            images_without_labels.extend(sorted_difference(images, labels))
+
+            if images.spilled_runs or labels.spilled_runs:
+                logger.info(
+                    "Split %s | limite de memória atingido: %d runs de imagens e %d de labels em disco",
+                    split,
+                    images.spilled_runs,
+                    labels.spilled_runs,
+                )
+
+            images.close()
+            labels.close()
+            label_names[split].close()
 
-            invalid_labels: List[str] = []
-            
-            # Validação básica do conteúdo dos arquivos de label
-            if labels_dir.exists():
-                for label_file in labels_dir.glob("*.txt"):
-                    try:
-                        with open(label_file, "r") as f:
-                            content = f.read().strip()
-                    
-                    except Exception as e:
-                        logger.error(f"Erro ao ler label {label_file}: {e}")
-                        invalid_labels.append(label_file.name)
-                        continue
-
-                    # ERRO: arquivo de label vazio
-                    if not content:
-                        logger.warning(f"Label vazio: {label_file}")
-                        invalid_labels.append(label_file.name)
-                        continue
-
-                    # Cada linha deve conter exatamente 5 valores padrão YOLO
-                    for line in content.splitlines():
-                        parts = line.split()
-
-                        if len(parts) != 5:
-                            logger.warning(f"Label mal formatada em {label_file}: {line}")
-                            invalid_labels.append(label_file.name)
-                            break
-            
             # Armazena resultados da validação para o split atual           
             validation_report[split] = {
                 "labels_without_images": labels_without_images,
@@ -111,9 +211,43 @@ def validate_dataset() -> Dict[str, Dict[str, List[str]]]:
                 len(images_without_labels),
                 len(invalid_labels),
             )
+
+            # Mantidas até o fim da validação: liberam a memória para os próximos splits
+            for issues in validation_report[split].values():
+                issues.spill()
     except Exception as e:
+        progress.stop(failed=True)
         logger.error("Erro durante a validação do dataset:", exc_info=e)
         raise
+
+    progress.stop()
     
     logger.info("Validação do dataset concluída.")
-    return validation_report
\ No newline at end of file
+    return validation_report
+
+
+def save_validation_report(
+    validation_report: Dict[str, Dict[str, SpillList]],
+    output_path: Path = VALIDATION_REPORT_PATH,
+) -> None:
+    """
+    Salva o relatório de validação em CSV (split, issue, file),
+    com uma linha por arquivo com problema.
+
+    Assume que o diretório já existe.
+    """
+
+    try:
+        with open(output_path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["split", "issue", "file"])
+
+            for split, issues in validation_report.items():
+                for issue, files in issues.items():
+                    writer.writerows([split, issue, name] for name in files)
+
+        logger.info(f"Relatório de validação salvo em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao salvar relatório de validação:", exc_info=e)
+        raise
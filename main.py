@@ -6,37 +6,440 @@ Ponto de entrada oficial do pipeline de EDA do projeto edge-vision-eda.
 Responsabilidade:
 - Orquestrar a execução do EDA de forma determinística
 - Garantir preparação dos diretórios de artifacts
-- Executar validação, métricas e plots na ordem correta
+- Executar validação, métricas, estatísticas de imagens e plots como um DAG de etapas
+
+Modos de execução:
+- python main.py [--fresh]               -> pipeline oficial de EDA (cache de etapas e checkpoints)
+- python main.py snapshot NOME           -> salva o estado atual do dataset
+- python main.py diff ANTERIOR [ATUAL]   -> compara dois estados (ou estado x dataset atual)
+- python main.py batch RAIZ [RAIZ ...]   -> EDA de vários datasets em um pool compartilhado
 
 Este main NÃO realiza testes manuais nem validações exploratórias.
 Ele assume que a configuração já foi validada previamente.
 """
 
+import argparse
 import logging
+import shutil
+from pathlib import Path
+from typing import List, Optional
 
 from config.settings import (
+    ANCHOR_BATCH_SIZE,
+    ANCHOR_CLUSTERS,
+    ANCHOR_ITERATIONS,
+    ANCHOR_SAMPLE_SIZE,
+    ANCHOR_SEED,
+    ANCHORS_PATH,
+    ARTIFACTS_DIFF_DIR,
+    ARTIFACTS_INDEX_DIR,
     ARTIFACTS_PLOTS_DIR,
+    ARTIFACTS_STATES_DIR,
+    BATCH_MAX_WORKERS,
+    BOX_DENSITY_GRID,
+    BOX_HISTOGRAM_RANGES,
+    BOX_HISTOGRAMS_PATH,
+    BOX_SAMPLE_PATH,
+    BOXES_PER_IMAGE_MAX,
+    CHUNK_SIZE_FILES,
+    CLASS_COOCCURRENCE_PATH,
+    COOCCURRENCE_MAX_CLASSES,
+    DATASET_DIR,
     DATASET_METRICS_PATH,
+    DATASET_SPLITS,
+    ENABLE_IMAGE_STATS,
     ENABLE_PLOTS,
+    ENABLE_SQLITE_INDEX,
+    HISTOGRAM_BINS,
+    IMAGE_STATS_CACHE_DIR,
+    IMAGE_STATS_MAX_SIDE,
+    IMAGE_STATS_PATH,
+    IMAGE_STATS_QUANTILES,
+    IMAGE_STATS_RANGES,
+    IMAGE_STATS_SKETCH_BINS,
+    IMAGE_STATS_SKETCH_PATH,
+    IMAGES_DIRNAME,
+    LABELS_DIRNAME,
+    SQLITE_INDEX_PATH,
+    VALIDATION_REPORT_PATH,
     ARTIFACTS_METRICS_DIR
     
 )
 
+from utils.checkpoint import Checkpoint
 from utils.logging_global import setup_logging
-from core.validator import validate_dataset
+from core.validator import save_validation_report, validate_dataset
 from core.metrics import compute_dataset_metrics, save_metrics_csv
-from viz.plots import plot_box_geometry_stats, plot_box_size_distribution
+from core.dataset_state import build_dataset_state, load_dataset_state, save_dataset_state
+from core.dataset_diff import diff_dataset_states, save_diff_reports
+from core.anchors import compute_anchor_metrics
+from core.image_stats import compute_image_stats
+from core.batch import run_batch
+from core.pipeline import Stage, run_stages
+from core.sqlite_index import build_sqlite_index
+from viz.plots import (
+    plot_box_feature_histograms,
+    plot_box_geometry_stats,
+    plot_box_size_distribution,
+    plot_box_wh_density,
+    plot_boxes_per_image
+)
+
+
+def _resolve_state_path(name: str) -> Path:
+    """
+    Aceita tanto um caminho para o JSON do estado quanto
+    apenas o nome de um estado salvo em artifacts/states.
+    """
+
+    path = Path(name)
+
+    if path.suffix == ".json" or path.exists():
+        return path
+
+    return ARTIFACTS_STATES_DIR / f"{name}.json"
+
+
+def run_snapshot(name: str, previous: Optional[str] = None) -> None:
+    """
+    Captura e salva o estado atual do dataset.
+
+    Se `previous` for informado, reaproveita os resultados
+    por arquivo do estado anterior (apenas o delta é parseado).
+    """
+
+    logger = logging.getLogger(__name__)
+    logger.info(f"Salvando estado do dataset: {name}")
+
+    try:
+        ARTIFACTS_STATES_DIR.mkdir(parents=True, exist_ok=True)
+
+        previous_state = load_dataset_state(_resolve_state_path(previous)) if previous else None
+        state = build_dataset_state(previous=previous_state)
+        save_dataset_state(state, _resolve_state_path(name))
+
+    except Exception as e:
+        logger.error("Falha ao salvar estado do dataset:", exc_info=e)
+        raise
+
+
+def run_diff(old: str, new: Optional[str] = None) -> None:
+    """
+    Compara dois estados salvos do dataset.
+
+    Se `new` não for informado, compara o estado `old`
+    com o dataset atual, parseando apenas os labels alterados.
+    """
+
+    logger = logging.getLogger(__name__)
+    logger.info("Iniciando diff entre versões do dataset")
+
+    try:
+        ARTIFACTS_DIFF_DIR.mkdir(parents=True, exist_ok=True)
+
+        old_state = load_dataset_state(_resolve_state_path(old))
+
+        if new:
+            new_state = load_dataset_state(_resolve_state_path(new))
+        else:
+            new_state = build_dataset_state(previous=old_state)
+
+        report = diff_dataset_states(old_state, new_state)
+        save_diff_reports(report, ARTIFACTS_DIFF_DIR)
 
-def main() -> None:
+        logger.info("Diff entre versões do dataset concluído.")
+
+    except Exception as e:
+        logger.error("Falha ao comparar versões do dataset:", exc_info=e)
+        raise
+
+
+def _read_dataset_roots(roots: List[str], roots_file: Optional[str]) -> List[Path]:
+    """
+    Junta as raízes de datasets informadas na linha de comando
+    e no arquivo opcional (uma raiz por linha, '#' para comentários).
+    """
+
+    paths = [Path(root) for root in roots]
+
+    if roots_file:
+        with open(roots_file, "r") as f:
+            for line in f:
+                line = line.strip()
+
+                if line and not line.startswith("#"):
+                    paths.append(Path(line))
+
+    return paths
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Interpreta os argumentos de linha de comando.
+
+    Sem subcomando, executa o pipeline oficial de EDA.
+    """
+
+    parser = argparse.ArgumentParser(description="Pipeline de EDA do edge-vision-eda")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Ignora checkpoints e o cache de etapas e recomeça do zero",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Salva o estado atual do dataset")
+    snapshot_parser.add_argument("name", help="Nome (ou caminho .json) do estado a salvar")
+    snapshot_parser.add_argument(
+        "--previous",
+        help="Estado anterior usado como cache por arquivo",
+    )
+
+    diff_parser = subparsers.add_parser("diff", help="Compara versões do dataset")
+    diff_parser.add_argument("old", help="Estado anterior (nome ou caminho .json)")
+    diff_parser.add_argument(
+        "new",
+        nargs="?",
+        help="Estado atual (nome ou caminho .json). Se omitido, usa o dataset atual",
+    )
+
+    batch_parser = subparsers.add_parser("batch", help="Executa o EDA em vários datasets")
+    batch_parser.add_argument("roots", nargs="*", help="Diretórios raiz dos datasets")
+    batch_parser.add_argument("--roots-file", help="Arquivo com uma raiz de dataset por linha")
+    batch_parser.add_argument("--workers", type=int, help="Número de processos do pool")
+
+    return parser.parse_args(argv)
+
+
+def _validation_stage() -> None:
+    """
+    Etapa de validação: valida o dataset e salva o relatório.
+    """
+
+    logger = logging.getLogger(__name__)
+    checkpoint = Checkpoint("validation", DATASET_DIR)
+
+    validation_report = validate_dataset(checkpoint=checkpoint)
+    save_validation_report(validation_report)
+
+    for split, issues in validation_report.items():
+
+        logger.info(
+                f"[{split}] labels sem imagem: {len(issues['labels_without_images'])} | "
+                f"imagens sem label: {len(issues['images_without_labels'])} | "
+                f"labels inválidos: {len(issues['invalid_labels'])}"
+            )
+
+    checkpoint.clear()
+
+
+def _metrics_stage() -> None:
+    """
+    Etapa de métricas: calcula e salva o CSV de métricas.
+    """
+
+    logger = logging.getLogger(__name__)
+    checkpoint = Checkpoint("metrics", DATASET_DIR)
+
+    metrics = compute_dataset_metrics(
+        checkpoint=checkpoint,
+        box_sample_path=BOX_SAMPLE_PATH,
+        histograms_path=BOX_HISTOGRAMS_PATH,
+        cooccurrence_path=CLASS_COOCCURRENCE_PATH,
+    )
+    save_metrics_csv(metrics)
+
+    logger.info(f"Métricas salvas em: {DATASET_METRICS_PATH}")
+    checkpoint.clear()
+
+
+def _anchors_stage() -> None:
+    """
+    Etapa de anchors: k-means (IoU) sobre a amostra de (w, h) do scan de métricas.
+    """
+
+    save_metrics_csv(compute_anchor_metrics(BOX_SAMPLE_PATH), ANCHORS_PATH)
+
+
+def _image_stats_stage() -> None:
+    """
+    Etapa de estatísticas de pixels: brilho, contraste, saturação e nitidez por split.
+    """
+
+    metrics = compute_image_stats(sketch_path=IMAGE_STATS_SKETCH_PATH)
+    save_metrics_csv(metrics, IMAGE_STATS_PATH)
+
+
+def _sqlite_index_stage() -> None:
+    """
+    Etapa do índice SQLite: arquivos, boxes e problemas de validação.
+    """
+
+    ARTIFACTS_INDEX_DIR.mkdir(parents=True, exist_ok=True)
+    build_sqlite_index(validation_report_path=VALIDATION_REPORT_PATH, output_path=SQLITE_INDEX_PATH)
+
+
+def _plots_stage() -> None:
+    """
+    Etapa de plots: gera os gráficos a partir do CSV de métricas
+    e dos histogramas pré-agregados.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    plot_box_geometry_stats(
+        csv_path=DATASET_METRICS_PATH,
+        output_path=ARTIFACTS_PLOTS_DIR / "box_geometry_stats.png",
+    )
+
+    plot_box_size_distribution(
+        csv_path=DATASET_METRICS_PATH,
+        output_path=ARTIFACTS_PLOTS_DIR / "box_size_distribution.png",
+    )
+
+    plot_box_feature_histograms(
+        npz_path=BOX_HISTOGRAMS_PATH,
+        output_path=ARTIFACTS_PLOTS_DIR / "box_feature_histograms.png",
+    )
+
+    plot_box_wh_density(
+        npz_path=BOX_HISTOGRAMS_PATH,
+        output_path=ARTIFACTS_PLOTS_DIR / "box_wh_density.png",
+    )
+
+    plot_boxes_per_image(
+        npz_path=BOX_HISTOGRAMS_PATH,
+        output_path=ARTIFACTS_PLOTS_DIR / "boxes_per_image.png",
+    )
+
+    logger.info("Plots do EDA gerados com sucesso")
+
+
+def build_stages() -> List[Stage]:
+    """
+    Declara o DAG de etapas do pipeline oficial.
+
+    validation e metrics leem o mesmo snapshot do dataset e são
+    independentes (executam em paralelo); anchors e plots dependem de metrics
+    e o índice SQLite (opcional) depende de validation. As estatísticas
+    de pixels (opcional) leem apenas as imagens e não dependem de outras etapas.
+    """
+
+    dataset_settings = {
+        "dataset_dir": str(DATASET_DIR),
+        "splits": DATASET_SPLITS,
+        "images_dirname": IMAGES_DIRNAME,
+        "labels_dirname": LABELS_DIRNAME,
+    }
+
+    stages = [
+        Stage(
+            name="validation",
+            run=_validation_stage,
+            outputs=(VALIDATION_REPORT_PATH,),
+            settings=dataset_settings,
+            reads_dataset=True,
+        ),
+        Stage(
+            name="metrics",
+            run=_metrics_stage,
+            outputs=(DATASET_METRICS_PATH, BOX_SAMPLE_PATH, BOX_HISTOGRAMS_PATH, CLASS_COOCCURRENCE_PATH),
+            settings={
+                **dataset_settings,
+                "anchor_sample_size": ANCHOR_SAMPLE_SIZE,
+                "histogram_bins": HISTOGRAM_BINS,
+                "histogram_ranges": BOX_HISTOGRAM_RANGES,
+                "density_grid": BOX_DENSITY_GRID,
+                "boxes_per_image_max": BOXES_PER_IMAGE_MAX,
+                "cooccurrence_max_classes": COOCCURRENCE_MAX_CLASSES,
+                # A ordem de soma por chunk altera os últimos dígitos das médias
+                "chunk_size": CHUNK_SIZE_FILES,
+            },
+            reads_dataset=True,
+        ),
+        Stage(
+            name="anchors",
+            run=_anchors_stage,
+            inputs=("metrics",),
+            outputs=(ANCHORS_PATH,),
+            settings={
+                "clusters": ANCHOR_CLUSTERS,
+                "batch_size": ANCHOR_BATCH_SIZE,
+                "iterations": ANCHOR_ITERATIONS,
+                "seed": ANCHOR_SEED,
+            },
+        ),
+    ]
+
+    if ENABLE_IMAGE_STATS:
+        stages.append(
+            Stage(
+                name="image_stats",
+                run=_image_stats_stage,
+                outputs=(IMAGE_STATS_PATH, IMAGE_STATS_SKETCH_PATH),
+                settings={
+                    **dataset_settings,
+                    "max_side": IMAGE_STATS_MAX_SIDE,
+                    "ranges": IMAGE_STATS_RANGES,
+                    "bins": IMAGE_STATS_SKETCH_BINS,
+                    "quantiles": IMAGE_STATS_QUANTILES,
+                },
+                reads_dataset=True,
+            )
+        )
+
+    if ENABLE_SQLITE_INDEX:
+        stages.append(
+            Stage(
+                name="sqlite_index",
+                run=_sqlite_index_stage,
+                inputs=("validation",),
+                outputs=(SQLITE_INDEX_PATH,),
+                settings=dataset_settings,
+                reads_dataset=True,
+            )
+        )
+
+    if ENABLE_PLOTS:
+        stages.append(
+            Stage(
+                name="plots",
+                run=_plots_stage,
+                inputs=("metrics",),
+                outputs=(
+                    ARTIFACTS_PLOTS_DIR / "box_geometry_stats.png",
+                    ARTIFACTS_PLOTS_DIR / "box_size_distribution.png",
+                    ARTIFACTS_PLOTS_DIR / "box_feature_histograms.png",
+                    ARTIFACTS_PLOTS_DIR / "box_wh_density.png",
+                    ARTIFACTS_PLOTS_DIR / "boxes_per_image.png",
+                ),
+            )
+        )
+
+    return stages
+
+
+def run_pipeline(fresh: bool = False) -> None:
     """
     Executa o pipeline oficial de EDA.
 
+    As etapas formam um DAG (ver build_stages) com cache por hash
+    das entradas: etapas inalteradas são puladas e etapas
+    independentes executam em paralelo.
+
+    Validação e métricas gravam checkpoints em artifacts/checkpoints;
+    se a execução anterior foi interrompida, elas são retomadas do
+    último checkpoint. Com `fresh`, checkpoints e cache são ignorados.
+
     Etapas:
     1. Inicialização do logging
     2. Preparação de diretórios de artifacts
     3. Validação estrutural do dataset
     4. Cálculo e persistência de métricas
-    5. Geração de plots (opcional)
+    5. Estimativa de anchor boxes
+    6. Estatísticas de pixels das imagens (opcional)
+    7. Índice SQLite (opcional)
+    8. Geração de plots (opcional)
     """
 
     # ETAPA 1 – LOGGING
@@ -53,50 +456,58 @@ def main() -> None:
         ARTIFACTS_METRICS_DIR.mkdir(parents=True, exist_ok=True)
         ARTIFACTS_PLOTS_DIR.mkdir(parents=True, exist_ok=True)
 
+        if fresh:
+            logger.info("Descartando checkpoints e cache anteriores (--fresh)")
+            Checkpoint("validation", DATASET_DIR).clear()
+            Checkpoint("metrics", DATASET_DIR).clear()
+            shutil.rmtree(IMAGE_STATS_CACHE_DIR, ignore_errors=True)
 
-        # ETAPA 3 - VALIDATION
-        logger.info("Executando validação estrutural do dataset")
-        
-        validation_report = validate_dataset()
-        
-        for split, issues in validation_report.items():
-    
-            logger.info(
-                    f"[{split}] labels sem imagem: {len(issues['labels_without_images'])} | "
-                    f"imagens sem label: {len(issues['images_without_labels'])} | "
-                    f"labels inválidos: {len(issues['invalid_labels'])}"
-                )
-        # ETAPA 4 - METRICS
-        logger.info("Calculando e salvando métricas do dataset")
-
-        metrics = compute_dataset_metrics()
-        save_metrics_csv(metrics)
-
-        logger.info(f"Métricas salvas em: {DATASET_METRICS_PATH}")
-
-        # ETAPA 5 - PLOTS
-        if ENABLE_PLOTS:
-            logger.info("Gerando plots habilitada")
-
-            plot_box_geometry_stats(
-                csv_path=DATASET_METRICS_PATH,
-                output_path=ARTIFACTS_PLOTS_DIR / "box_geometry_stats.png",
-            )
+        if not ENABLE_PLOTS:
+            logger.info("Geração de plots desabilitada (ENABLE_PLOTS=False)")
 
-            plot_box_size_distribution(
-                csv_path=DATASET_METRICS_PATH,
-                output_path=ARTIFACTS_PLOTS_DIR / "box_size_distribution.png",
-            )
+        # ETAPAS 3 a 8 - DAG (validation -> sqlite_index || metrics -> anchors, plots || image_stats)
+        status = run_stages(build_stages(), force=fresh)
 
-            logger.info("Plots do EDA gerados com sucesso")
-        else:
-            logger.info("Geração de plots desabilitada (ENABLE_PLOTS=False)")
-        
+        logger.info(
+            "Resumo das etapas: "
+            + " | ".join(f"{name}: {result}" for name, result in status.items())
+        )
         logger.info("Pipeline oficial de EDA concluído com sucesso.")
     
     except Exception as e:
         logger.error("Falha na execução do pipeline de EDA:", exc_info=e)
         raise
 
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Ponto de entrada da linha de comando.
+
+    Sem subcomando, executa o pipeline oficial de EDA.
+    """
+
+    args = _parse_args(argv)
+
+    if args.command == "snapshot":
+        setup_logging()
+        run_snapshot(args.name, args.previous)
+
+    elif args.command == "diff":
+        setup_logging()
+        run_diff(args.old, args.new)
+
+    elif args.command == "batch":
+        setup_logging()
+        roots = _read_dataset_roots(args.roots, args.roots_file)
+
+        if not roots:
+            raise SystemExit("Nenhum dataset informado para o modo batch")
+
+        run_batch(roots, max_workers=args.workers or BATCH_MAX_WORKERS)
+
+    else:
+        run_pipeline(fresh=args.fresh)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,14 @@
+"""
+conftest.py
+
+Configuração comum dos testes: permite importar os módulos
+do projeto (config, core, utils) a partir da raiz do repositório.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
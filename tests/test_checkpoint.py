@@ -0,0 +1,209 @@
+"""
+Testes de retomada: uma execução interrompida e retomada do checkpoint
+deve produzir o mesmo resultado que uma execução sem interrupção.
+"""
+
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import core.metrics as metrics_module
+import core.validator as validator_module
+import utils.checkpoint as checkpoint_module
+import utils.progress as progress_module
+from config.settings import DATASET_SPLITS, IMAGES_DIRNAME, LABELS_DIRNAME
+from core.metrics import compute_dataset_metrics
+from core.validator import validate_dataset
+from utils.checkpoint import Checkpoint
+
+CHUNK_SIZE = 7
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch, tmp_path):
+    """
+    Chunks pequenos, checkpoint a cada chunk e eventos de progresso fora do repositório.
+    """
+
+    monkeypatch.setattr(metrics_module, "CHUNK_SIZE_FILES", CHUNK_SIZE)
+    monkeypatch.setattr(validator_module, "CHUNK_SIZE_FILES", CHUNK_SIZE)
+    monkeypatch.setattr(checkpoint_module, "CHUNK_SIZE_FILES", CHUNK_SIZE)
+    monkeypatch.setattr(checkpoint_module, "CHECKPOINT_INTERVAL_S", 0)
+    monkeypatch.setattr(progress_module, "PROGRESS_EVENTS_PATH", tmp_path / "progress_events.jsonl")
+
+
+@pytest.fixture
+def dataset_dir(tmp_path) -> Path:
+    """
+    Dataset sintético com labels válidos, vazios, mal formatados
+    e pares imagem/label incompletos.
+    """
+
+    rng = random.Random(0)
+    root = tmp_path / "dataset"
+
+    for split, count in zip(DATASET_SPLITS, (60, 25, 15)):
+        images_dir = root / split / IMAGES_DIRNAME
+        labels_dir = root / split / LABELS_DIRNAME
+        images_dir.mkdir(parents=True)
+        labels_dir.mkdir(parents=True)
+
+        for index in range(count):
+            name = f"img_{index:04d}"
+
+            if index % 11 != 3:
+                (images_dir / f"{name}.jpg").write_bytes(b"")
+
+            if index % 13 == 5:
+                continue
+
+            kind = rng.random()
+
+            if kind < 0.1:
+                content = ""
+            elif kind < 0.15:
+                content = "0 0.5 0.5\n"
+            else:
+                lines = [
+                    f"{rng.randrange(6)} {rng.random():.4f} {rng.random():.4f} "
+                    f"{rng.uniform(0.01, 0.9):.4f} {rng.uniform(0.01, 0.9):.4f}"
+                    for _ in range(rng.randrange(1, 6))
+                ]
+                content = "\n".join(lines) + "\n"
+
+            (labels_dir / f"{name}.txt").write_text(content)
+
+    return root
+
+
+def _interrupt_after(monkeypatch, module, name: str, calls: int):
+    """
+    Substitui module.name por uma versão que falha após `calls` chamadas.
+
+    Retorna a função original.
+    """
+
+    original = getattr(module, name)
+    counter = {"calls": 0}
+
+    def wrapper(*args, **kwargs):
+        counter["calls"] += 1
+
+        if counter["calls"] > calls:
+            raise Interrupted()
+
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, wrapper)
+    return original
+
+
+def _run_metrics(dataset_dir: Path, output_dir: Path, checkpoint=None):
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = compute_dataset_metrics(
+        dataset_dir,
+        checkpoint=checkpoint,
+        box_sample_path=output_dir / "box_sample.npy",
+        histograms_path=output_dir / "box_histograms.npz",
+        cooccurrence_path=output_dir / "class_cooccurrence.csv",
+    )
+
+    histograms = np.load(output_dir / "box_histograms.npz")
+
+    return {
+        "rows": rows,
+        "sample": np.load(output_dir / "box_sample.npy"),
+        "histograms": {key: histograms[key] for key in histograms.files},
+        "cooccurrence": (output_dir / "class_cooccurrence.csv").read_text(),
+    }
+
+
+def _assert_same_metrics(result, expected):
+    assert result["rows"] == expected["rows"]
+    assert result["cooccurrence"] == expected["cooccurrence"]
+    np.testing.assert_array_equal(result["sample"], expected["sample"])
+    assert result["histograms"].keys() == expected["histograms"].keys()
+
+    for key, values in expected["histograms"].items():
+        np.testing.assert_array_equal(result["histograms"][key], values)
+
+
+def _report_lists(report):
+    return {split: {issue: list(files) for issue, files in issues.items()} for split, issues in report.items()}
+
+
+@pytest.mark.parametrize("chunks_before_interruption", [1, 6, 10])
+def test_metrics_resume_matches_uninterrupted_run(monkeypatch, tmp_path, dataset_dir, chunks_before_interruption):
+    expected = _run_metrics(dataset_dir, tmp_path / "reference")
+
+    checkpoint_dir = tmp_path / "checkpoints"
+    original = _interrupt_after(monkeypatch, metrics_module, "_process_chunk", chunks_before_interruption)
+
+    with pytest.raises(Interrupted):
+        _run_metrics(dataset_dir, tmp_path / "interrupted", Checkpoint("metrics", dataset_dir, checkpoint_dir))
+
+    with open(checkpoint_dir / "metrics.json", "r") as f:
+        done_before = sum(json.load(f)["state"]["offsets"].values())
+
+    # Conta os arquivos processados na retomada
+    processed = {"files": 0}
+
+    def counting(label_files, split, accumulator, progress):
+        count = original(label_files, split, accumulator, progress)
+        processed["files"] += count
+        return count
+
+    monkeypatch.setattr(metrics_module, "_process_chunk", counting)
+
+    result = _run_metrics(dataset_dir, tmp_path / "resumed", Checkpoint("metrics", dataset_dir, checkpoint_dir))
+
+    total_files = sum(len(list((dataset_dir / split / LABELS_DIRNAME).glob("*.txt"))) for split in DATASET_SPLITS)
+    assert done_before > 0
+    assert processed["files"] == total_files - done_before
+    _assert_same_metrics(result, expected)
+
+
+def test_metrics_checkpoint_discarded_when_labels_change(monkeypatch, tmp_path, dataset_dir):
+    checkpoint_dir = tmp_path / "checkpoints"
+    original = _interrupt_after(monkeypatch, metrics_module, "_process_chunk", 3)
+
+    with pytest.raises(Interrupted):
+        _run_metrics(dataset_dir, tmp_path / "interrupted", Checkpoint("metrics", dataset_dir, checkpoint_dir))
+
+    monkeypatch.setattr(metrics_module, "_process_chunk", original)
+
+    # Label já processado antes da interrupção, com o mesmo número de arquivos
+    label = sorted((dataset_dir / DATASET_SPLITS[0] / LABELS_DIRNAME).glob("*.txt"))[0]
+    label.write_text("0 0.5 0.5 0.123 0.456\n")
+
+    expected = _run_metrics(dataset_dir, tmp_path / "reference")
+    result = _run_metrics(dataset_dir, tmp_path / "resumed", Checkpoint("metrics", dataset_dir, checkpoint_dir))
+
+    _assert_same_metrics(result, expected)
+
+
+@pytest.mark.parametrize("labels_before_interruption", [CHUNK_SIZE + 2, 20, 70])
+def test_validation_resume_matches_uninterrupted_run(monkeypatch, tmp_path, dataset_dir, labels_before_interruption):
+    expected = _report_lists(validate_dataset(dataset_dir))
+
+    checkpoint_dir = tmp_path / "checkpoints"
+    original = _interrupt_after(monkeypatch, validator_module, "_is_invalid_label", labels_before_interruption)
+
+    with pytest.raises(Interrupted):
+        validate_dataset(dataset_dir, Checkpoint("validation", dataset_dir, checkpoint_dir))
+
+    assert (checkpoint_dir / "validation.json").exists()
+
+    monkeypatch.setattr(validator_module, "_is_invalid_label", original)
+
+    result = _report_lists(validate_dataset(dataset_dir, Checkpoint("validation", dataset_dir, checkpoint_dir)))
+
+    assert result == expected
@@ -0,0 +1,116 @@
+"""
+Testes do acumulador de métricas: boxes por imagem e
+coocorrência de classes por split.
+"""
+
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from config.settings import DATASET_SPLITS
+from core.metrics import MetricsAccumulator
+
+
+def _random_images(seed: int, count: int, class_pool: np.ndarray):
+    """
+    Imagens sintéticas: (split_index, [class_id, ...]), com classes
+    repetidas na mesma imagem e imagens negativas.
+    """
+
+    rng = np.random.default_rng(seed)
+    images = []
+
+    for _ in range(count):
+        split_index = int(rng.integers(len(DATASET_SPLITS)))
+        box_count = int(rng.integers(0, 8))
+        images.append((split_index, rng.choice(class_pool, size=box_count).tolist()))
+
+    return images
+
+
+def _brute_force_cooccurrence(images):
+    """
+    {(split, a, b): imagens com as classes a e b (a <= b)}.
+    """
+
+    counts = {}
+
+    for split_index, class_ids in images:
+        for a, b in combinations_with_replacement(sorted(set(class_ids)), 2):
+            key = (split_index, a, b)
+            counts[key] = counts.get(key, 0) + 1
+
+    return counts
+
+
+def _accumulated_cooccurrence(accumulator: MetricsAccumulator):
+    accumulator._flush_images()
+    classes = accumulator.cooccurrence_classes
+    counts = {}
+
+    for split_index in range(len(DATASET_SPLITS)):
+        matrix = accumulator.class_cooccurrence[split_index]
+        np.testing.assert_array_equal(matrix, matrix.T)
+
+        for a, b in zip(*np.nonzero(np.triu(matrix))):
+            counts[(split_index, int(classes[a]), int(classes[b]))] = int(matrix[a, b])
+
+    return counts
+
+
+def _accumulate(images, chunk_size: int) -> MetricsAccumulator:
+    """
+    Acumula as imagens em chunks combinados com merge(), como no scan.
+    """
+
+    total = MetricsAccumulator()
+
+    for start in range(0, len(images), chunk_size):
+        chunk = MetricsAccumulator()
+
+        for split_index, class_ids in images[start:start + chunk_size]:
+            chunk.add_image(split_index, len(class_ids), class_ids)
+
+        total.merge(chunk)
+
+    return total
+
+
+def test_cooccurrence_matches_brute_force():
+    images = _random_images(seed=0, count=500, class_pool=np.arange(12))
+    expected = _brute_force_cooccurrence(images)
+
+    for chunk_size in (1, 7, 64, 500):
+        assert _accumulated_cooccurrence(_accumulate(images, chunk_size)) == expected
+
+
+def test_cooccurrence_sparse_class_ids_use_dense_matrix():
+    # Ids esparsos (ex.: label corrompido) não dimensionam a matriz pelo maior id
+    images = _random_images(seed=1, count=200, class_pool=np.array([0, 3, 100_000, 2**40]))
+    accumulator = _accumulate(images, chunk_size=16)
+
+    assert _accumulated_cooccurrence(accumulator) == _brute_force_cooccurrence(images)
+    assert accumulator.class_cooccurrence.shape == (len(DATASET_SPLITS), 4, 4)
+
+
+def test_cooccurrence_survives_checkpoint_state():
+    images = _random_images(seed=2, count=300, class_pool=np.arange(5, 15))
+    accumulator = _accumulate(images, chunk_size=50)
+    restored = MetricsAccumulator.from_state(accumulator.to_state())
+
+    assert _accumulated_cooccurrence(restored) == _brute_force_cooccurrence(images)
+
+
+def test_boxes_per_image_by_split():
+    images = _random_images(seed=3, count=400, class_pool=np.arange(4))
+    accumulator = _accumulate(images, chunk_size=33)
+
+    for split_index in range(len(DATASET_SPLITS)):
+        box_counts = [len(class_ids) for index, class_ids in images if index == split_index]
+        expected = np.bincount(box_counts, minlength=accumulator.boxes_per_image.shape[1])
+
+        np.testing.assert_array_equal(accumulator.boxes_per_image[split_index], expected)
+        assert accumulator.split_boxes[split_index] == sum(box_counts)
+        assert accumulator.max_boxes_per_image[split_index] == max(box_counts, default=0)
+
+    assert accumulator.images_with_objects == sum(1 for _, class_ids in images if class_ids)
@@ -0,0 +1,105 @@
+"""
+Testes das estruturas com limite de memória (utils/spill.py),
+nos caminhos em memória, com spill em disco e com compactação de runs.
+"""
+
+import random
+
+import pytest
+
+from utils.spill import MAX_OPEN_RUNS, SortedRunSet, SpillList, sorted_difference
+
+
+def _names(seed: int, count: int, universe: int):
+    """
+    Nomes de arquivo aleatórios, com repetições.
+    """
+
+    rng = random.Random(seed)
+    return [f"img_{rng.randrange(universe):06d}.jpg" for _ in range(count)]
+
+
+def _run_set(items, max_items: int) -> SortedRunSet:
+    names = SortedRunSet(max_items)
+    names.update(items)
+    return names
+
+
+@pytest.mark.parametrize(
+    "max_items, count, spilled",
+    [
+        (10_000, 500, False),  # apenas memória
+        (50, 500, True),       # poucos runs em disco
+        (3, 2_000, True),      # runs suficientes para compactação
+    ],
+)
+def test_sorted_run_set_matches_sorted_set(max_items, count, spilled):
+    items = _names(seed=count, count=count, universe=count // 2)
+    names = _run_set(items, max_items)
+
+    assert (names.spilled_runs > 0) == spilled
+    assert names.spilled_runs <= MAX_OPEN_RUNS
+    assert list(names) == sorted(set(items))
+    assert len(names) == len(set(items))
+
+    # Iterações repetidas produzem o mesmo resultado
+    assert list(names) == sorted(set(items))
+
+    names.close()
+
+
+def test_sorted_run_set_compaction_keeps_adding():
+    # Itens adicionados após a compactação continuam sendo considerados
+    names = SortedRunSet(max_items=2)
+    expected = set()
+
+    for index in range(MAX_OPEN_RUNS * 6):
+        item = f"label_{(index * 7919) % 150:04d}.txt"
+        names.add(item)
+        expected.add(item)
+
+    assert names.spilled_runs <= MAX_OPEN_RUNS
+    assert list(names) == sorted(expected)
+
+    names.close()
+
+
+@pytest.mark.parametrize("max_items", [10_000, 7, 2])
+def test_sorted_difference_matches_set_difference(max_items):
+    left_items = _names(seed=1, count=800, universe=600)
+    right_items = _names(seed=2, count=800, universe=600)
+
+    left = _run_set(left_items, max_items)
+    right = _run_set(right_items, max_items)
+
+    assert list(sorted_difference(left, right)) == sorted(set(left_items) - set(right_items))
+    assert list(sorted_difference(right, left)) == sorted(set(right_items) - set(left_items))
+
+    left.close()
+    right.close()
+
+
+def test_sorted_difference_empty_inputs():
+    names = ["a.jpg", "b.jpg", "c.jpg"]
+
+    assert list(sorted_difference(names, [])) == names
+    assert list(sorted_difference([], names)) == []
+    assert list(sorted_difference(names, names)) == []
+
+
+def test_spill_list_preserves_insertion_order():
+    items = _names(seed=3, count=1_000, universe=10_000)
+    spill_list = SpillList(max_items=64)
+    spill_list.extend(items)
+
+    assert len(spill_list) == len(items)
+    assert list(spill_list) == items
+
+    # spill() descarrega o restante sem alterar conteúdo nem ordem
+    spill_list.spill()
+    spill_list.append("last.jpg")
+
+    assert len(spill_list._memory) == 1
+    assert list(spill_list) == items + ["last.jpg"]
+
+    spill_list.close()
@@ -0,0 +1,176 @@
+"""
+checkpoint.py
+
+Responsável por persistir o progresso de etapas longas do pipeline,
+permitindo retomar uma execução interrompida.
+
+Cada checkpoint é composto por:
+- um JSON com o estado da etapa (offsets por split, acumuladores),
+  gravado de forma atômica
+- logs append-only (uma string por linha) para listas que crescem
+  com o dataset; o JSON registra o tamanho válido de cada log
+
+Ao retomar, cada log é truncado para o tamanho registrado no último
+checkpoint, descartando o que foi escrito depois dele.
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from config.settings import (
+    ARTIFACTS_CHECKPOINTS_DIR,
+    CHECKPOINT_INTERVAL_S,
+    CHUNK_SIZE_FILES
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 3
+
+
+class Checkpoint:
+    """
+    Checkpoint de uma etapa do pipeline sobre um dataset.
+
+    O estado só é reaproveitado se o "fingerprint" gravado
+    (dataset, tamanho de chunk e dados informados pela etapa, como
+    nome, tamanho e mtime dos labels) for idêntico ao da execução atual.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dataset_dir: Path,
+        directory: Path = ARTIFACTS_CHECKPOINTS_DIR,
+    ) -> None:
+        self.name = name
+        self.directory = directory
+        self.path = directory / f"{name}.json"
+        self._base_fingerprint = {
+            "version": CHECKPOINT_VERSION,
+            "dataset_dir": str(Path(dataset_dir).resolve()),
+            "chunk_size": CHUNK_SIZE_FILES,
+        }
+        self._fingerprint: Dict[str, object] = dict(self._base_fingerprint)
+        self._last_save = time.monotonic()
+
+    def log_path(self, suffix: str) -> Path:
+        return self.directory / f"{self.name}_{suffix}.log"
+
+    # LEITURA
+    def load(self, fingerprint: Dict[str, object]) -> Optional[Dict[str, object]]:
+        """
+        Retorna o estado salvo, ou None se não houver checkpoint
+        compatível com o fingerprint informado.
+        """
+
+        self._fingerprint = {**self._base_fingerprint, **fingerprint}
+        self._last_save = time.monotonic()
+
+        if not self.path.exists():
+            # Descarta logs órfãos de uma execução sem checkpoint gravado
+            self.clear()
+            return None
+
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+
+        except Exception as e:
+            logger.warning(f"Checkpoint ilegível, ignorando {self.path}: {e}")
+            self.clear()
+            return None
+
+        if saved.get("fingerprint") != self._fingerprint:
+            logger.warning(f"Checkpoint incompatível com a execução atual, ignorando: {self.path}")
+            self.clear()
+            return None
+
+        logger.info(f"Retomando etapa '{self.name}' a partir do checkpoint: {self.path}")
+        return saved["state"]
+
+    def read_log(self, suffix: str, size: int) -> Iterator[str]:
+        """
+        Trunca o log para o tamanho registrado e itera suas linhas.
+        """
+
+        path = self.log_path(suffix)
+
+        if not path.exists():
+            return
+
+        os.truncate(path, size)
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                yield line.rstrip("\n")
+
+    # ESCRITA
+    def append_log(self, suffix: str, items: Iterable[str]) -> int:
+        """
+        Acrescenta itens ao log e retorna o novo tamanho em bytes.
+        """
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with open(self.log_path(suffix), "a", encoding="utf-8") as f:
+            f.writelines(f"{item}\n" for item in items)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def due(self) -> bool:
+        """
+        Indica se já passou CHECKPOINT_INTERVAL_S desde a última gravação.
+
+        Permite evitar a serialização do estado quando save() não gravaria.
+        """
+
+        return time.monotonic() - self._last_save >= CHECKPOINT_INTERVAL_S
+
+    def save(self, state: Dict[str, object], force: bool = False) -> bool:
+        """
+        Grava o estado de forma atômica.
+
+        Sem `force`, respeita o intervalo mínimo CHECKPOINT_INTERVAL_S.
+        Retorna True se o checkpoint foi gravado.
+        """
+
+        if not force and not self.due():
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"fingerprint": self._fingerprint, "state": state}, f)
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, self.path)
+
+        except Exception as e:
+            logger.error(f"Erro ao gravar checkpoint {self.path}:", exc_info=e)
+            raise
+
+        self._last_save = time.monotonic()
+        return True
+
+    def clear(self) -> None:
+        """
+        Remove o checkpoint e seus logs.
+        """
+
+        if not self.directory.exists():
+            return
+
+        self.path.unlink(missing_ok=True)
+        self.path.with_suffix(".json.tmp").unlink(missing_ok=True)
+
+        for log_path in self.directory.glob(f"{self.name}_*.log"):
+            log_path.unlink(missing_ok=True)
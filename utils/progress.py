@@ -0,0 +1,267 @@
+"""
+progress.py
+
+Responsável por reportar o progresso de varreduras longas
+(validação e métricas) com baixo custo no loop principal.
+
+Cada varredura cria um ProgressReporter com o total de arquivos
+da listagem do diretório. O loop apenas incrementa dois contadores
+(arquivos e bytes); uma thread em segundo plano lê os contadores a
+cada PROGRESS_INTERVAL_S e emite um evento com:
+- arquivos processados / total e percentual
+- arquivos/s e MB/s (no último intervalo)
+- ETA (pela taxa média desde o início)
+- utilização da thread da varredura (tempo de CPU / tempo decorrido);
+  valores baixos indicam espera por I/O
+
+Os eventos são enviados a sinks: o log do projeto e um arquivo
+JSON lines (PROGRESS_EVENTS_PATH) para consumo por agendadores.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config.settings import (
+    ENABLE_PROGRESS,
+    PROGRESS_EVENTS_PATH,
+    PROGRESS_INTERVAL_S
+)
+
+logger = logging.getLogger(__name__)
+
+ProgressEvent = Dict[str, object]
+ProgressSink = Callable[[ProgressEvent], None]
+
+
+# SINKS
+def _format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{secs:02d}s"
+
+
+def log_sink(event: ProgressEvent) -> None:
+    """
+    Escreve o evento no log do projeto.
+    """
+
+    utilization = event["utilization"]
+
+    logger.info(
+        "Progresso %s | %d/%d arquivos (%.1f%%) | %.0f arquivos/s | %.2f MB/s | ETA %s | utilização %s",
+        event["stage"],
+        event["files_done"],
+        event["files_total"],
+        event["percent"],
+        event["files_per_s"],
+        event["mb_per_s"],
+        _format_eta(event["eta_s"]),
+        "?" if utilization is None else f"{utilization:.0%}",
+    )
+
+
+class JsonLinesSink:
+    """
+    Acrescenta cada evento como uma linha JSON em um arquivo.
+
+    Cada evento é gravado com uma única escrita em modo append,
+    de modo que vários processos podem compartilhar o arquivo.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def __call__(self, event: ProgressEvent) -> None:
+        line = json.dumps(event) + "\n"
+
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+
+def default_sinks() -> List[ProgressSink]:
+    sinks: List[ProgressSink] = [log_sink]
+
+    if PROGRESS_EVENTS_PATH is not None:
+        sinks.append(JsonLinesSink(PROGRESS_EVENTS_PATH))
+
+    return sinks
+
+
+# REPORTER
+class ProgressReporter:
+    """
+    Progresso de uma varredura.
+
+    O loop da varredura altera apenas `files_done` e `bytes_done`
+    (um único escritor por reporter); a thread de relatório apenas lê.
+    Deve ser iniciado e encerrado na thread que executa a varredura:
+
+        with ProgressReporter("metrics", total, dataset_dir) as progress:
+            for ...:
+                progress.files_done += 1
+                progress.bytes_done += len(data)  # bytes lidos
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        files_total: int,
+        dataset_dir: Optional[Path] = None,
+        interval: float = PROGRESS_INTERVAL_S,
+        sinks: Optional[List[ProgressSink]] = None,
+        enabled: bool = ENABLE_PROGRESS,
+    ) -> None:
+        self.stage = stage
+        self.files_total = files_total
+        self.dataset_dir = dataset_dir
+        self.interval = interval
+        self.sinks = default_sinks() if sinks is None else sinks
+        self.enabled = enabled
+
+        # Contadores alterados no loop principal
+        self.files_done = 0
+        self.bytes_done = 0
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._clock_id: Optional[int] = None
+        self._first: Optional[tuple] = None
+
+    # CICLO DE VIDA
+    def start(self, files_done: int = 0) -> "ProgressReporter":
+        """
+        Inicia os relatórios periódicos.
+
+        `files_done` registra arquivos já processados (ex.: retomada de
+        checkpoint); eles contam no percentual, mas não nas taxas.
+        """
+
+        self.files_done = files_done
+
+        # Relógio de CPU da thread da varredura, lido pela thread de relatório
+        if self.enabled and hasattr(time, "pthread_getcpuclockid"):
+            self._clock_id = time.pthread_getcpuclockid(threading.get_ident())
+
+        self._first = (time.monotonic(), files_done, 0, self._thread_cpu())
+        self._last = self._first
+
+        if not self.enabled:
+            return self
+
+        self._thread = threading.Thread(target=self._run, name=f"progress-{self.stage}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, failed: bool = False) -> None:
+        """
+        Encerra os relatórios e emite o evento final.
+
+        Sem efeito se o reporter não foi iniciado.
+        """
+
+        if not self.enabled or self._first is None:
+            return
+
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join()
+
+        self._emit("failed" if failed else "finished")
+
+    def __enter__(self) -> "ProgressReporter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.stop(failed=exc_type is not None)
+
+    # RELATÓRIOS
+    def _thread_cpu(self) -> Optional[float]:
+        if self._clock_id is None:
+            return None
+
+        try:
+            return time.clock_gettime(self._clock_id)
+
+        except OSError:
+            return None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._emit("progress")
+
+    def snapshot(self, event: str = "progress") -> ProgressEvent:
+        """
+        Lê os contadores e calcula taxas, ETA e utilização.
+
+        Eventos "progress" usam as taxas do último intervalo;
+        os eventos finais usam a média desde o início.
+        """
+
+        now = time.monotonic()
+        files_done = self.files_done
+        bytes_done = self.bytes_done
+        cpu = self._thread_cpu()
+
+        start_time, start_files, _, _ = self._first
+        last_time, last_files, last_bytes, last_cpu = self._last if event == "progress" else self._first
+        self._last = (now, files_done, bytes_done, cpu)
+
+        window = max(now - last_time, 1e-9)
+        elapsed = max(now - start_time, 1e-9)
+        average_rate = (files_done - start_files) / elapsed
+        remaining = max(self.files_total - files_done, 0)
+
+        eta = None
+
+        if event == "progress" and average_rate > 0:
+            eta = remaining / average_rate
+        elif event == "finished":
+            eta = 0.0
+
+        utilization = None
+
+        if cpu is not None and last_cpu is not None:
+            utilization = min(max((cpu - last_cpu) / window, 0.0), 1.0)
+
+        return {
+            "event": event,
+            "stage": self.stage,
+            "dataset": None if self.dataset_dir is None else str(self.dataset_dir),
+            "pid": os.getpid(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": round(elapsed, 3),
+            "files_done": files_done,
+            "files_total": self.files_total,
+            "percent": 100.0 * files_done / self.files_total if self.files_total else 100.0,
+            "bytes_done": bytes_done,
+            "files_per_s": (files_done - last_files) / window,
+            "mb_per_s": (bytes_done - last_bytes) / window / (1024 * 1024),
+            "avg_files_per_s": average_rate,
+            "eta_s": eta,
+            "utilization": utilization,
+        }
+
+    def _emit(self, event: str) -> None:
+        payload = self.snapshot(event)
+
+        for sink in self.sinks:
+            try:
+                sink(payload)
+
+            except Exception as e:
+                logger.warning(f"Falha ao emitir evento de progresso ({self.stage}): {e}")
@@ -0,0 +1,213 @@
+"""
+spill.py
+
+Estruturas acumuladoras com limite de memória.
+
+Quando o número de itens em memória ultrapassa o limite,
+os itens são descarregados (spill) em arquivos temporários
+e reunidos novamente apenas na leitura final.
+
+Este módulo:
+- não conhece a estrutura do dataset
+- trabalha apenas com strings (uma por linha nos arquivos temporários)
+"""
+
+import heapq
+import tempfile
+from typing import IO, Iterable, Iterator, List, Optional
+
+from config.settings import MEMORY_BUDGET_MB, SPILL_DIR
+
+# Custo aproximado (bytes) de um nome de arquivo mantido em memória
+APPROX_ITEM_BYTES = 200
+
+# Número máximo de runs abertos antes de compactá-los em um único arquivo
+MAX_OPEN_RUNS = 32
+
+
+def budget_items(share: float = 1.0) -> int:
+    """
+    Converte uma fração do MEMORY_BUDGET_MB em número máximo de itens.
+    """
+
+    return max(1, int(MEMORY_BUDGET_MB * 1024 * 1024 * share / APPROX_ITEM_BYTES))
+
+
+def _new_spill_file() -> IO[str]:
+    """
+    Cria um arquivo temporário removido automaticamente ao ser fechado.
+    """
+
+    return tempfile.TemporaryFile(mode="w+", encoding="utf-8", dir=SPILL_DIR)
+
+
+def _read_lines(spill_file: IO[str]) -> Iterator[str]:
+    """
+    Lê um arquivo de spill do início, removendo as quebras de linha.
+    """
+
+    spill_file.flush()
+    spill_file.seek(0)
+
+    for line in spill_file:
+        yield line.rstrip("\n")
+
+
+class SpillList:
+    """
+    Lista append-only de strings com limite de memória.
+
+    Suporta len() e iteração (na ordem de inserção).
+    """
+
+    def __init__(self, max_items: Optional[int] = None) -> None:
+        self.max_items = max_items or budget_items()
+        self._memory: List[str] = []
+        self._file: Optional[IO[str]] = None
+        self._spilled = 0
+
+    def append(self, item: str) -> None:
+        self._memory.append(item)
+
+        if len(self._memory) >= self.max_items:
+            self._spill()
+
+    def extend(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.append(item)
+
+    def spill(self) -> None:
+        """
+        Descarrega em disco todos os itens ainda em memória.
+        """
+
+        if self._memory:
+            self._spill()
+
+    def _spill(self) -> None:
+        if self._file is None:
+            self._file = _new_spill_file()
+
+        self._file.seek(0, 2)
+        self._file.writelines(f"{item}\n" for item in self._memory)
+        self._spilled += len(self._memory)
+        self._memory = []
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._memory)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._file is not None:
+            yield from _read_lines(self._file)
+
+        yield from list(self._memory)
+
+    def __repr__(self) -> str:
+        return f"SpillList(len={len(self)}, spilled={self._spilled})"
+
+    def close(self) -> None:
+        """
+        Remove o arquivo temporário associado.
+        """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SortedRunSet:
+    """
+    Conjunto de strings com limite de memória.
+
+    Ao atingir o limite, os itens em memória são ordenados e
+    gravados como um "run" em arquivo temporário. A leitura final
+    faz o merge dos runs, produzindo os itens ordenados e sem repetição.
+    """
+
+    def __init__(self, max_items: Optional[int] = None) -> None:
+        self.max_items = max_items or budget_items()
+        self._memory: set = set()
+        self._runs: List[IO[str]] = []
+
+    def add(self, item: str) -> None:
+        self._memory.add(item)
+
+        if len(self._memory) >= self.max_items:
+            self._spill()
+
+    def update(self, items: Iterable[str]) -> None:
+        for item in items:
+            self.add(item)
+
+    def _spill(self) -> None:
+        run = _new_spill_file()
+        run.writelines(f"{item}\n" for item in sorted(self._memory))
+        self._runs.append(run)
+        self._memory = set()
+
+        # Compacta os runs para limitar o número de arquivos abertos
+        if len(self._runs) >= MAX_OPEN_RUNS:
+            merged = _new_spill_file()
+            merged.writelines(f"{item}\n" for item in self)
+
+            for old_run in self._runs:
+                old_run.close()
+
+            self._runs = [merged]
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Itera os itens em ordem crescente e sem repetição.
+
+        Não deve ser iterado por dois consumidores ao mesmo tempo,
+        pois os runs compartilham a posição de leitura dos arquivos.
+        """
+
+        streams = [_read_lines(run) for run in self._runs]
+        streams.append(iter(sorted(self._memory)))
+
+        previous = None
+
+        for item in heapq.merge(*streams):
+            if item != previous:
+                yield item
+                previous = item
+
+    def __len__(self) -> int:
+        if not self._runs:
+            return len(self._memory)
+
+        return sum(1 for _ in self)
+
+    def close(self) -> None:
+        """
+        Remove os arquivos temporários associados.
+        """
+
+        for run in self._runs:
+            run.close()
+
+        self._runs = []
+
+
+def sorted_difference(left: Iterable[str], right: Iterable[str]) -> Iterator[str]:
+    """
+    Itens de `left` ausentes em `right`.
+
+    Ambas as entradas devem estar ordenadas e sem repetição;
+    a saída preserva a ordem e usa memória constante.
+    """
+
+    right_iter = iter(right)
+    current = next(right_iter, None)
+
+    for item in left:
+        while current is not None and current < item:
+            current = next(right_iter, None)
+
+        if current != item:
+            yield item
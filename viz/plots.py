@@ -1,17 +1,21 @@
 """
 plots.py
 
-Geração de plots a partir do CSV agregado (section, metric, value).
+Geração de plots a partir do CSV agregado (section, metric, value)
+e dos histogramas pré-agregados (.npz) gerados no scan de métricas.
 
 Premissas:
 - CSV no formato longo
+- Distribuições desenhadas a partir de bins, nunca de boxes individuais
+  (custo constante, independente do tamanho do dataset)
 - Sem criação de diretórios
 - Apenas leitura e visualização
 """
 
 from pathlib import Path
 import logging
-from typing import List
+from typing import Dict, List
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -131,4 +135,154 @@ def plot_box_size_distribution(csv_path: Path, output_path: Path) -> None:
 
     except Exception as e:
         logger.error("Erro ao gerar plot de distribuição de tamanhos das boxes", exc_info=e)
-        raise
\ No newline at end of file
+        raise
+
+
+def _load_histograms(npz_path: Path, keys: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Carrega os arrays esperados do .npz de histogramas.
+    """
+
+    if not npz_path.exists():
+        logger.error(f"Arquivo de histogramas não encontrado: {npz_path}")
+        raise FileNotFoundError(npz_path)
+
+    with np.load(npz_path) as data:
+        missing_keys = set(keys) - set(data.files)
+
+        if missing_keys:
+            logger.error(f"Histogramas ausentes em {npz_path}: {sorted(missing_keys)}")
+            raise ValueError("Arquivo de histogramas incompleto")
+
+        return {key: data[key] for key in keys}
+
+
+def plot_box_feature_histograms(npz_path: Path, output_path: Path) -> None:
+    """
+    Gera histogramas de largura, altura, área e proporção das boxes.
+
+    Arrays esperados:
+    - features, feature_ranges, feature_hist
+    """
+    logger.info("Iniciando geração dos histogramas das features das boxes")
+
+    try:
+        data = _load_histograms(npz_path, ["features", "feature_ranges", "feature_hist"])
+
+        fig, axes = plt.subplots(2, 2, figsize=(12, 8))
+
+        for ax, feature, (low, high), hist in zip(
+            axes.flat, data["features"], data["feature_ranges"], data["feature_hist"]
+        ):
+            edges = np.linspace(low, high, len(hist) + 1)
+            ax.stairs(hist, edges, fill=True)
+            ax.set_title(str(feature))
+            ax.set_xlabel("Valor normalizado" if feature != "proportion" else "Largura / altura")
+            ax.set_ylabel("Quantidade de boxes")
+
+        fig.suptitle("Distribuição das Features das Bounding Boxes")
+        fig.tight_layout()
+        fig.savefig(output_path)
+        plt.close(fig)
+
+        logger.info(f"Histogramas das features das boxes salvos em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao gerar histogramas das features das boxes", exc_info=e)
+        raise
+
+
+def plot_box_wh_density(npz_path: Path, output_path: Path) -> None:
+    """
+    Gera um hexbin de densidade largura x altura das boxes.
+
+    Cada célula da grade 2D pré-agregada entra como um ponto
+    (centro da célula) com peso igual à sua contagem.
+
+    Arrays esperados:
+    - wh_density
+    """
+    logger.info("Iniciando geração do plot de densidade largura x altura das boxes")
+
+    try:
+        density = _load_histograms(npz_path, ["wh_density"])["wh_density"]
+
+        grid = density.shape[0]
+        centers = (np.arange(grid) + 0.5) / grid
+        w_centers, h_centers = np.meshgrid(centers, centers, indexing="ij")
+        filled = density > 0
+
+        plt.figure(figsize=(8, 7))
+        plt.hexbin(
+            w_centers[filled],
+            h_centers[filled],
+            C=density[filled],
+            reduce_C_function=np.sum,
+            gridsize=max(grid // 2, 1),
+            extent=(0.0, 1.0, 0.0, 1.0),
+            bins="log",
+        )
+        plt.colorbar(label="Quantidade de boxes (log)")
+        plt.title("Densidade Largura x Altura das Bounding Boxes")
+        plt.xlabel("Largura normalizada")
+        plt.ylabel("Altura normalizada")
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close()
+
+        logger.info(f"Plot de densidade largura x altura salvo em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao gerar plot de densidade largura x altura das boxes", exc_info=e)
+        raise
+
+
+def plot_boxes_per_image(npz_path: Path, output_path: Path) -> None:
+    """
+    Gera a distribuição do número de boxes por imagem, por split
+    (barras agrupadas).
+
+    O último bin acumula as imagens com mais boxes que o limite;
+    bins vazios após a maior contagem não são desenhados.
+
+    Arrays esperados:
+    - splits, boxes_per_image (split x número de boxes)
+    """
+    logger.info("Iniciando geração do plot de boxes por imagem")
+
+    try:
+        data = _load_histograms(npz_path, ["splits", "boxes_per_image"])
+        splits, counts = data["splits"], data["boxes_per_image"]
+
+        # Omite os bins vazios após a maior contagem observada
+        used = np.flatnonzero(counts.sum(axis=0))
+        num_bins = int(used[-1]) + 1 if used.size else 1
+        labels = [str(index) for index in range(num_bins)]
+
+        if num_bins == counts.shape[1]:
+            labels[-1] = f"{num_bins - 1}+"
+
+        counts = counts[:, :num_bins]
+
+        bar_width = 0.8 / len(splits)
+        positions = np.arange(num_bins)
+
+        plt.figure(figsize=(12, 5))
+
+        for index, (split, split_counts) in enumerate(zip(splits, counts)):
+            plt.bar(positions + index * bar_width, split_counts, width=bar_width, label=str(split))
+
+        plt.xticks(positions + 0.4 - bar_width / 2, labels, rotation=90)
+        plt.legend()
+        plt.title("Distribuição de Boxes por Imagem")
+        plt.xlabel("Boxes por imagem")
+        plt.ylabel("Quantidade de imagens")
+        plt.tight_layout()
+        plt.savefig(output_path)
+        plt.close()
+
+        logger.info(f"Plot de boxes por imagem salvo em: {output_path}")
+
+    except Exception as e:
+        logger.error("Erro ao gerar plot de boxes por imagem", exc_info=e)
+        raise